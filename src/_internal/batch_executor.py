@@ -0,0 +1,151 @@
+import importlib
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from configs import ExecutionPaths, SiteSpec
+from src._internal.executor import execute_modules
+from src._internal.load_config import load_config
+from src._internal.resource_governor import ResourceBudget
+from utilities.io_operations import copy_directory, get_or_create_directory, clear_directory
+from utilities.proj_logging import LoggerFactory
+
+logger = LoggerFactory.get_logger(name=__name__)
+
+
+@dataclass(frozen=True)
+class SiteResult:
+    name: str
+    succeeded: bool
+    duration_seconds: float
+    execution_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+def warm_worker(module_names: List[str]) -> None:
+    """
+    Pool initializer: import the module pipeline (and pandas with it) in every worker.
+    The forkserver already preloads it, so this is normally a no-op that only surfaces
+    import errors.
+    """
+    for module_name in module_names:
+        try:
+            importlib.import_module(f"modules.{module_name}.main")
+        except Exception as e:
+            # the site run reports the real error
+            logger.warning(f"Could not pre-import module '{module_name}': {e}")
+
+
+def execute_site(site: SiteSpec, config_data: Dict[str, Any], resources: Optional[ResourceBudget] = None) -> SiteResult:
+    """
+    Runs the configured module pipeline for one site in its own execution directory.
+    Never raises, failures are returned so one bad site can't take down the batch.
+    Everything logged while the site runs is prefixed with the site name.
+    """
+    with LoggerFactory.context(site.name):
+        return _execute_site(site, config_data, resources)
+
+
+def _execute_site(site: SiteSpec, config_data: Dict[str, Any], resources: Optional[ResourceBudget]) -> SiteResult:
+    started = time.perf_counter()
+    execution_paths = None
+    try:
+        overrides = [f"input_path={site.input_path}", f"output_path={site.output_path}"] + site.overrides
+        runtime_config = load_config(config_data=config_data, overrides=overrides)
+
+        site_root = get_or_create_directory(runtime_config.general.execution_path / site.name)
+        execution_paths = ExecutionPaths.create(site_root)
+        get_or_create_directory(execution_paths.current_exec_path)
+        get_or_create_directory(execution_paths.execution_output_path)
+        logger.info(f"Execution ID: {execution_paths.execution_id}")
+
+        execute_modules(runtime_config, execution_paths, resources)
+
+        copy_directory(execution_paths.execution_output_path, get_or_create_directory(runtime_config.general.output_path))
+
+        if runtime_config.general.delete_execution_data:
+            clear_directory(execution_paths.current_exec_path)
+
+        return SiteResult(
+            name=site.name,
+            succeeded=True,
+            duration_seconds=time.perf_counter() - started,
+            execution_id=execution_paths.execution_id,
+        )
+
+    except Exception as e:
+        logger.error(f"Site execution failed: {e}")
+        return SiteResult(
+            name=site.name,
+            succeeded=False,
+            duration_seconds=time.perf_counter() - started,
+            execution_id=execution_paths.execution_id if execution_paths else None,
+            error=f"{type(e).__name__}: {e}",
+        )
+
+
+def execute_sites(
+    sites: List[SiteSpec],
+    config_data: Dict[str, Any],
+    max_workers: Optional[int] = None,
+) -> List[SiteResult]:
+    """
+    Fans the sites out over one shared process pool.
+    Each site runs in its own worker call with its own config and execution directory.
+
+    Workers are forked from a forkserver that has the module pipeline preloaded, so a
+    fresh worker costs a fork, not an import. Every worker is replaced after
+    `batch_sites_per_worker` sites (default 1), so module level state can't leak from
+    one site into the next.
+
+    Without `max_workers` the pool is sized from the cgroup CPU limit and how many
+    `batch_worker_memory_mb` workers fit the memory budget; every worker gets an
+    equal share of the budget.
+    """
+    budget = ResourceBudget.detect(config_data.get('memory_budget_fraction', 0.8))
+    max_workers = max_workers or budget.worker_count(config_data.get('batch_worker_memory_mb', 512) * 1024 * 1024)
+    worker_budget = ResourceBudget(
+        memory_limit_bytes=budget.memory_limit_bytes,
+        cpu_limit=budget.cpu_limit / max_workers,
+        memory_budget_bytes=budget.memory_budget_bytes // max_workers,
+    )
+    execution_order = config_data.get('execution_order', [])
+    sites_per_worker = config_data.get('batch_sites_per_worker', 1)
+    logger.info(f"Starting batch of {len(sites)} sites on {max_workers} workers.")
+
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload([f"modules.{module_name}.main" for module_name in execution_order])
+
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=warm_worker,
+                             initargs=(execution_order,), max_tasks_per_child=sites_per_worker) as pool:
+        futures = {pool.submit(execute_site, site, config_data, worker_budget): site for site in sites}
+        for future in as_completed(futures):
+            site = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # the worker itself died (e.g. OOM kill), not the site pipeline
+                result = SiteResult(name=site.name, succeeded=False, duration_seconds=0.0,
+                                    error=f"{type(e).__name__}: {e}")
+            status = "succeeded" if result.succeeded else f"failed ({result.error})"
+            logger.info(f"[{result.name}] {status} in {result.duration_seconds:.2f}s")
+            results.append(result)
+
+    log_fleet_summary(results, time.perf_counter() - started)
+    return results
+
+
+def log_fleet_summary(results: List[SiteResult], elapsed_seconds: float) -> None:
+    failed = [result for result in results if not result.succeeded]
+    sites_per_minute = len(results) / (elapsed_seconds / 60) if elapsed_seconds else 0.0
+
+    logger.info(
+        f"Batch finished: {len(results) - len(failed)}/{len(results)} sites succeeded "
+        f"in {elapsed_seconds:.1f}s ({sites_per_minute:.1f} sites/minute)."
+    )
+    for result in sorted(failed, key=lambda r: r.name):
+        logger.error(f"[{result.name}] {result.error}")
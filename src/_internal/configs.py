@@ -2,8 +2,10 @@ import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
+from dataset_registry import DatasetRegistry
+from resource_governor import ResourceBudget
 from utilities.io_operations import find_project_root
 
 from utilities.proj_logging import LoggerFactory
@@ -30,6 +32,8 @@ class ModuleExecutionContext:
     input_path: Path
     output_path: Path
     config: Dict[str, Any]
+    datasets: Optional[DatasetRegistry] = None   # in-memory tables shared between chained modules
+    resources: Optional[ResourceBudget] = None   # memory/CPU budget for chunk sizes, workers, spilling
 
 
 @dataclass(frozen=True)
@@ -42,6 +46,10 @@ class GeneralConfig:
     execution_order: List[str] = field(default_factory=list)
     load_all_files: bool = True
     delete_execution_data: bool = False
+    dataset_memory_budget_mb: int = 512
+    memory_budget_fraction: float = 0.8
+    observation_store_path: Optional[Path] = None
+    observation_store_datasets: List[str] = field(default_factory=list)
 
 
 @dataclass(frozen=True)
@@ -51,6 +59,18 @@ class RuntimeConfig:
     storage_type: str
 
 
+@dataclass(frozen=True)
+class SiteSpec:
+    """
+    One entry of a batch manifest: a site's input/output paths plus
+    `key=value` overrides applied on top of the shared config.
+    """
+    name: str
+    input_path: str
+    output_path: str
+    overrides: List[str] = field(default_factory=list)
+
+
 @dataclass(frozen=True)
 class ProjectPaths:
     root: Path
@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from proj_logging import LoggerFactory
+logger = LoggerFactory.get_logger(name=__name__)
+
+
+@dataclass
+class DatasetRegistry:
+    """
+    Named in-memory tables shared by the modules of one execution.
+
+    A module publishes a DataFrame under a name, later modules consume it without
+    the write CSV -> copy -> parse round trip. Tables stay in memory until the
+    budget is exceeded, then the least recently used ones are spilled to
+    `spill_path` and read back on demand.
+
+    Consumers get the stored object itself, treat it as read-only.
+    Modules that don't opt in keep using the input/output directories.
+    """
+    spill_path: Path
+    memory_budget_bytes: int
+    _tables: "OrderedDict[str, pd.DataFrame]" = field(default_factory=OrderedDict, repr=False)
+    _sizes: Dict[str, int] = field(default_factory=dict, repr=False)
+    _spilled: Dict[str, Path] = field(default_factory=dict, repr=False)
+
+    def publish(self, name: str, table: pd.DataFrame, persist: bool = False) -> None:
+        """
+        Register `table` under `name`, replacing any previous version.
+        `persist` also writes it to disk right away, it stays in memory as well.
+        """
+        self.discard(name)
+        self._tables[name] = table
+        self._sizes[name] = int(table.memory_usage(deep=True).sum())
+        logger.debug(f"Published dataset '{name}' ({self._sizes[name]} bytes)")
+
+        if persist:
+            self._write(name, table)
+        self._enforce_budget()
+
+    def get(self, name: str) -> pd.DataFrame:
+        if name in self._tables:
+            self._tables.move_to_end(name)
+            return self._tables[name]
+        if name in self._spilled:
+            logger.debug(f"Reading spilled dataset '{name}' from {self._spilled[name]}")
+            return pd.read_pickle(self._spilled[name])
+        raise KeyError(f"No dataset named '{name}'")
+
+    def has(self, name: str) -> bool:
+        return name in self._tables or name in self._spilled
+
+    def names(self) -> List[str]:
+        return sorted(set(self._tables) | set(self._spilled))
+
+    def discard(self, name: str) -> None:
+        self._tables.pop(name, None)
+        self._sizes.pop(name, None)
+        spilled = self._spilled.pop(name, None)
+        if spilled is not None:
+            spilled.unlink(missing_ok=True)
+
+    def memory_usage(self) -> int:
+        return sum(self._sizes.values())
+
+    def _write(self, name: str, table: pd.DataFrame) -> Path:
+        self.spill_path.mkdir(parents=True, exist_ok=True)
+        path = self.spill_path / f"{name}.pkl"
+        table.to_pickle(path)
+        self._spilled[name] = path
+        return path
+
+    def _enforce_budget(self) -> None:
+        while self._tables and self.memory_usage() > self.memory_budget_bytes:
+            name, table = next(iter(self._tables.items()))
+            if name not in self._spilled:
+                self._write(name, table)
+            del self._tables[name]
+            size = self._sizes.pop(name)
+            logger.info(f"Dataset memory budget exceeded, spilled '{name}' ({size} bytes) to disk")
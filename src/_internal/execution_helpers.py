@@ -1,7 +1,10 @@
 import logging
 from pathlib import Path
+from typing import Optional
 
 from src._internal.configs import RuntimeConfig, ExecutionPaths, ModuleExecutionContext
+from src._internal.dataset_registry import DatasetRegistry
+from src._internal.resource_governor import ResourceBudget
 from src._internal.utilities.io_operations import get_or_create_directory, copy_directory, directory_is_empty, copy_file
 
 from utilities.proj_logging import LoggerFactory
@@ -11,12 +14,16 @@ def prepare_module_execution_context(
     runtime_config: RuntimeConfig,
     module_name: str,
     execution_paths: ExecutionPaths,
+    datasets: Optional[DatasetRegistry] = None,
+    resources: Optional[ResourceBudget] = None,
 ) -> ModuleExecutionContext:
     """
     Sets up the input/output environment for a single module execution.
     - Creates module input/output directories.
     - Copies required input files.
     - Merges output from previous modules if chaining is enabled.
+    - Hands over the execution's dataset registry for in-memory chaining.
+    - Hands over the resource budget modules size their work by.
     - Returns a ModuleExecutionContext object with metadata and config.
     """
     module_input = get_or_create_directory(execution_paths.current_exec_path / module_name / "input")
@@ -41,5 +48,7 @@ def prepare_module_execution_context(
         name=module_name,
         input_path=module_input,
         output_path=module_output,
-        config=module_config
+        config=module_config,
+        datasets=datasets,
+        resources=resources
     )
\ No newline at end of file
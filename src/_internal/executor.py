@@ -1,7 +1,11 @@
 import importlib
 import logging
+from typing import Optional
 
 from configs import ModuleExecutionContext, RuntimeConfig, ProjectPaths, ExecutionPaths
+from dataset_registry import DatasetRegistry
+from observation_store import ObservationStore
+from resource_governor import ResourceBudget, RssMonitor
 from src._internal.execution_helpers import prepare_module_execution_context
 from utilities.io_operations import copy_directory
 from utilities.proj_logging import LoggerFactory
@@ -16,6 +20,7 @@ def execute_module(
     """
     Dynamically imports and runs a module's main() function with input/output/config.
     Copies output from module output to the central execution-output folder after successful execution.
+    RSS is tracked while the module runs, going over the resource budget is logged as a warning.
     """
     try:
         logger.info(f"Starting execution for module: {module_ctx.name}")
@@ -26,9 +31,15 @@ def execute_module(
             raise AttributeError(f"Module '{module_ctx.name}' missing main()")
 
         # Call module's main()
-        module.main(context=module_ctx)
+        if module_ctx.resources is not None:
+            with RssMonitor(module_ctx.resources, label=module_ctx.name):
+                module.main(context=module_ctx)
+        else:
+            module.main(context=module_ctx)
 
         logger.info(f"Execution of module '{module_ctx.name}' completed.")
+        if module_ctx.datasets is not None and module_ctx.datasets.names():
+            logger.debug(f"Datasets available after '{module_ctx.name}': {module_ctx.datasets.names()}")
 
         # Copy results to the execution-output folder
         if module_ctx.output_path.exists():
@@ -45,12 +56,26 @@ def execute_module(
 def execute_modules(
     runtime_config: RuntimeConfig,
     execution_paths: ExecutionPaths,
+    resources: Optional[ResourceBudget] = None,
 ) -> None:
     """
     Executes all modules defined in runtime_config.general.execution_order.
     For each module, prepares an execution context and runs it.
+    All modules share one dataset registry, so they can hand tables over in memory.
+    `resources` defaults to a budget detected from the cgroup limits; the batch runner
+    passes each worker its share instead.
     """
     logger.info("Starting execution of all modules.")
+    if resources is None:
+        resources = ResourceBudget.detect(runtime_config.general.memory_budget_fraction)
+
+    datasets = DatasetRegistry(
+        spill_path=execution_paths.current_exec_path / 'datasets',
+        memory_budget_bytes=min(
+            runtime_config.general.dataset_memory_budget_mb * 1024 * 1024,
+            resources.spill_threshold_bytes(),
+        ),
+    )
 
     for module_name in runtime_config.general.execution_order:
         logger.info(f"Preparing execution context for module: {module_name}")
@@ -58,8 +83,29 @@ def execute_modules(
             runtime_config=runtime_config,
             module_name=module_name,
             execution_paths=execution_paths,
+            datasets=datasets,
+            resources=resources,
         )
 
         execute_module(module_ctx, execution_paths)
 
+    if runtime_config.general.observation_store_path:
+        store_observations(runtime_config, datasets)
+
     logger.info("All modules executed successfully.")
+
+
+def store_observations(runtime_config: RuntimeConfig, datasets: DatasetRegistry) -> None:
+    """
+    Appends the configured datasets to the local observation store, one table per dataset.
+    Datasets no module published in this run are skipped.
+    """
+    store = ObservationStore(runtime_config.general.observation_store_path)
+    try:
+        for name in runtime_config.general.observation_store_datasets:
+            if not datasets.has(name):
+                logger.warning(f"Dataset '{name}' was not published; nothing stored.")
+                continue
+            store.upsert(name, datasets.get(name))
+    finally:
+        store.close()
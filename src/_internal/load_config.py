@@ -2,7 +2,7 @@ import tomllib
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
-from configs import GeneralConfig, RuntimeConfig
+from configs import GeneralConfig, RuntimeConfig, SiteSpec
 from utilities.io_operations import find_project_root
 
 from utilities.proj_logging import LoggerFactory
@@ -56,22 +56,68 @@ def parse_general_config(config_data: Dict[str, Any]) -> GeneralConfig:
         standard_temperature=config_data.get('standard_temperature', 0),
         execution_order=config_data.get('execution_order', []),
         load_all_files=config_data.get('load_all_files', True),
-        delete_execution_data=config_data.get('delete_execution_data', False)
+        delete_execution_data=config_data.get('delete_execution_data', False),
+        dataset_memory_budget_mb=config_data.get('dataset_memory_budget_mb', 512),
+        memory_budget_fraction=config_data.get('memory_budget_fraction', 0.8),
+        observation_store_path=resolve_path(config_data['observation_store_path']) if config_data.get('observation_store_path') else None,
+        observation_store_datasets=config_data.get('observation_store_datasets', [])
     )
 
-def load_config(module_name: Optional[str] = None, config_file: Optional[str] = None, overrides: Optional[List[str]] = None) -> RuntimeConfig:
+def load_config(module_name: Optional[str] = None, config_file: Optional[str] = None, overrides: Optional[List[str]] = None,
+                config_data: Optional[Dict[str, Any]] = None) -> RuntimeConfig:
+    """
+    `config_data` skips reading `config_file`, for callers that already parsed it
+    (the batch runner reads the shared config once for the whole fleet).
+    """
     logger.info("Starting configuration load process...")
-    config_path = Path(config_file).resolve() if config_file else find_project_root() / 'app-config.toml'
-
-    config_data = read_toml_config(config_path)
+    if config_data is None:
+        config_path = Path(config_file).resolve() if config_file else find_project_root() / 'app-config.toml'
+        config_data = read_toml_config(config_path)
 
     if overrides:
         config_data = apply_overrides_to_dict(config_data, overrides)
 
     general_config = parse_general_config(config_data)
-    module_config = config_data.get(module_name, {}) if module_name else {}
+    # without a module name every module section is kept, keyed by module name,
+    # which is what prepare_module_execution_context looks each module up in
+    if module_name:
+        module_config = config_data.get(module_name, {})
+    else:
+        module_config = {name: section for name, section in config_data.items() if isinstance(section, dict)}
     storage_type = config_data.get('storage_type', 'local')
 
     logger.info(f"Configuration loaded successfully. Storage type: {storage_type}, Module: {module_name or 'None'}")
 
     return RuntimeConfig(general=general_config, module=module_config, storage_type=storage_type)
+
+def load_manifest(manifest_file: str) -> List[SiteSpec]:
+    """
+    Read a batch manifest, a TOML file with one [[sites]] table per site:
+
+        [[sites]]
+        name = 'CK_S0000088'
+        input_path = 'tests/resources/PV_B1_raw_input'
+        output_path = 'tests/resources/CK_S0000088'
+        overrides = ['standard_temperature=15']   # optional
+    """
+    manifest_data = read_toml_config(Path(manifest_file).resolve())
+
+    sites = []
+    for entry in manifest_data.get('sites', []):
+        try:
+            sites.append(SiteSpec(
+                name=entry['name'],
+                input_path=entry['input_path'],
+                output_path=entry['output_path'],
+                overrides=list(entry.get('overrides', [])),
+            ))
+        except KeyError as e:
+            logger.error(f"Manifest entry {entry} is missing {e}")
+            raise ValueError(f"Manifest entry {entry} is missing {e}") from e
+
+    names = [site.name for site in sites]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate site names in manifest {manifest_file}")
+
+    logger.info(f"Loaded manifest with {len(sites)} sites")
+    return sites
@@ -0,0 +1,228 @@
+"""
+Local observation store: module results appended into one SQLite database (WAL mode)
+instead of piling up as CSVs in per-execution directories.
+
+Every table is keyed on (companyID, siteID, TankID, ATGRecordDateHour) and stored
+WITHOUT ROWID, so rows are clustered by tank and hour and a tank's time range is a
+single index range scan. A `<table>_latest` companion table keeps the newest row
+per tank, so latest-per-tank lookups don't scan history.
+
+    python -m src._internal.observation_store --db data/observations.db range \
+        --table water_ingress_observations --tank 1-88-3 --start 2025-01-01
+    python -m src._internal.observation_store --db data/observations.db latest \
+        --table water_ingress_observations
+"""
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from proj_logging import LoggerFactory
+logger = LoggerFactory.get_logger(name=__name__)
+
+TANK_COLUMNS = ["companyID", "siteID", "TankID"]
+HOUR_COLUMN = "ATGRecordDateHour"
+KEY_COLUMNS = TANK_COLUMNS + [HOUR_COLUMN]
+BATCH_ROWS = 10_000
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_type(dtype) -> str:
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def canonical_times(values: pd.Series) -> pd.Series:
+    """
+    Timestamps in the one format the store keeps them in, `YYYY-MM-DDTHH:MM:SS[.ffffff]+00:00`.
+    Naive values are UTC. With a single offset the strings compare in time order,
+    which is what the range queries on ATGRecordDateHour rely on.
+    """
+    parsed = pd.to_datetime(values, errors="coerce", format="ISO8601", utc=True)
+    text = parsed.dt.strftime("%Y-%m-%dT%H:%M:%S")
+    micros = parsed.dt.microsecond
+    fraction = ("." + micros.astype(str).str.zfill(6)).where(micros > 0, "")
+    return (text + fraction + "+00:00").where(parsed.notna(), None)
+
+
+def normalize_hour(value) -> str:
+    """
+    Query bound in the stored ATGRecordDateHour format.
+    """
+    normalized = canonical_times(pd.Series([value], dtype=object)).iloc[0]
+    if pd.isna(normalized):
+        raise ValueError(f"Invalid time bound '{value}'")
+    return normalized
+
+
+def split_tank_key(tank: str) -> List[str]:
+    """
+    `companyID-siteID-TankID` -> [companyID, siteID, TankID]
+    """
+    parts = tank.split('-', 2)
+    if len(parts) != 3:
+        raise ValueError(f"Invalid tank key '{tank}', expected companyID-siteID-TankID")
+    return parts
+
+
+class ObservationStore:
+    """
+    Thin wrapper around one SQLite connection. Writers are serialized by SQLite,
+    readers don't block them thanks to WAL.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.connection:
+            yield self.connection
+
+    def _columns(self, table: str) -> List[str]:
+        return [row[1] for row in self.connection.execute(f"PRAGMA table_info({_quote(table)})")]
+
+    def _ensure_table(self, table: str, frame: pd.DataFrame) -> None:
+        """
+        Create `table` and `<table>_latest` from the frame's columns, or add the columns
+        an existing table is missing.
+        """
+        for name in (table, f"{table}_latest"):
+            key = KEY_COLUMNS if name == table else TANK_COLUMNS
+            existing = self._columns(name)
+            if not existing:
+                columns = ", ".join(f"{_quote(c)} {_sql_type(frame[c].dtype)}" for c in frame.columns)
+                primary_key = ", ".join(_quote(c) for c in key)
+                self.connection.execute(
+                    f"CREATE TABLE {_quote(name)} ({columns}, PRIMARY KEY ({primary_key})) WITHOUT ROWID")
+                logger.info(f"Created observation table '{name}' in {self.db_path}")
+                continue
+            for column in frame.columns:
+                if column not in existing:
+                    self.connection.execute(
+                        f"ALTER TABLE {_quote(name)} ADD COLUMN {_quote(column)} {_sql_type(frame[column].dtype)}")
+
+    def upsert(self, table: str, frame: pd.DataFrame) -> int:
+        """
+        Insert or replace rows by (tank, ATGRecordDateHour), in batches of BATCH_ROWS
+        within one transaction. Returns the number of rows written.
+        """
+        # a run without observations publishes an empty frame, possibly without columns
+        if frame.empty:
+            return 0
+        missing = [c for c in KEY_COLUMNS if c not in frame.columns]
+        if missing:
+            raise ValueError(f"Cannot store '{table}', missing key columns {missing}")
+
+        frame = frame.copy()
+        for column in frame.columns:
+            if column == HOUR_COLUMN or pd.api.types.is_datetime64_any_dtype(frame[column].dtype):
+                frame[column] = canonical_times(frame[column])
+        if frame[HOUR_COLUMN].isna().any():
+            raise ValueError(f"Cannot store '{table}', {HOUR_COLUMN} has missing or invalid timestamps")
+        # only each tank's newest row can move <table>_latest
+        newest = frame.sort_values(HOUR_COLUMN).groupby(TANK_COLUMNS, sort=False).tail(1)
+
+        columns = ", ".join(_quote(c) for c in frame.columns)
+        placeholders = ", ".join("?" for _ in frame.columns)
+
+        def upsert_sql(name: str, key: List[str], newer_only: bool) -> str:
+            updates = ", ".join(f"{_quote(c)} = excluded.{_quote(c)}" for c in frame.columns if c not in key)
+            condition = f" WHERE excluded.{_quote(HOUR_COLUMN)} >= {_quote(name)}.{_quote(HOUR_COLUMN)}" if newer_only else ""
+            # a frame of only key columns has nothing to update
+            action = f"DO UPDATE SET {updates}{condition}" if updates else "DO NOTHING"
+            return (f"INSERT INTO {_quote(name)} ({columns}) VALUES ({placeholders}) "
+                    f"ON CONFLICT ({', '.join(_quote(c) for c in key)}) {action}")
+
+        def to_rows(rows: pd.DataFrame) -> list:
+            return list(rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None))
+
+        rows = to_rows(frame)
+        with self._transaction() as connection:
+            self._ensure_table(table, frame)
+            history_sql = upsert_sql(table, KEY_COLUMNS, newer_only=False)
+            for start in range(0, len(rows), BATCH_ROWS):
+                connection.executemany(history_sql, rows[start:start + BATCH_ROWS])
+            connection.executemany(upsert_sql(f"{table}_latest", TANK_COLUMNS, newer_only=True), to_rows(newest))
+
+        logger.info(f"Stored {len(rows)} rows in '{table}'")
+        return len(rows)
+
+    def query_range(self, table: str, tank: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Rows of one tank (`companyID-siteID-TankID`) with start <= ATGRecordDateHour < end.
+        """
+        # tank keys arrive as text, CAST them to the stored type so the primary key index is used
+        conditions = [f"{_quote(c)} = CAST(? AS {self._column_type(table, c)})" for c in TANK_COLUMNS]
+        params = split_tank_key(tank)
+        if start is not None:
+            conditions.append(f"{_quote(HOUR_COLUMN)} >= ?")
+            params.append(normalize_hour(start))
+        if end is not None:
+            conditions.append(f"{_quote(HOUR_COLUMN)} < ?")
+            params.append(normalize_hour(end))
+
+        sql = (f"SELECT * FROM {_quote(table)} WHERE {' AND '.join(conditions)} "
+               f"ORDER BY {_quote(HOUR_COLUMN)}")
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    def latest(self, table: str, tanks: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Newest row per tank, optionally limited to the given tank keys.
+        """
+        latest = pd.read_sql_query(f"SELECT * FROM {_quote(f'{table}_latest')}", self.connection)
+        if tanks is None:
+            return latest
+        keys = latest[TANK_COLUMNS].astype(str).agg('-'.join, axis=1)
+        return latest[keys.isin(set(tanks))].reset_index(drop=True)
+
+    def _column_type(self, table: str, column: str) -> str:
+        for row in self.connection.execute(f"PRAGMA table_info({_quote(table)})"):
+            if row[1] == column:
+                return row[2] or "TEXT"
+        raise ValueError(f"No column '{column}' in observation table '{table}'")
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Query the local observation store')
+    parser.add_argument('--db', type=Path, required=True, help='Path to the observation store')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    range_parser = commands.add_parser('range', help='One tank over a time range')
+    range_parser.add_argument('--table', required=True)
+    range_parser.add_argument('--tank', required=True, help='companyID-siteID-TankID')
+    range_parser.add_argument('--start', default=None)
+    range_parser.add_argument('--end', default=None)
+
+    latest_parser = commands.add_parser('latest', help='Newest row per tank')
+    latest_parser.add_argument('--table', required=True)
+    latest_parser.add_argument('--tanks', nargs='*', default=None, help='companyID-siteID-TankID keys')
+
+    cli_args = parser.parse_args()
+    store = ObservationStore(cli_args.db)
+    try:
+        if cli_args.command == 'range':
+            result = store.query_range(cli_args.table, cli_args.tank, cli_args.start, cli_args.end)
+        else:
+            result = store.latest(cli_args.table, cli_args.tanks)
+        result.to_csv(sys.stdout, index=False)
+    finally:
+        store.close()
@@ -0,0 +1,207 @@
+"""
+Memory/CPU budget for an execution, derived from the container's cgroup limits.
+
+Modules get the budget through ModuleExecutionContext.resources and use it to size
+chunks, worker counts and spill thresholds instead of hard-coding them.
+"""
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import List, Optional
+
+from proj_logging import LoggerFactory
+logger = LoggerFactory.get_logger(name=__name__)
+
+CGROUP_ROOT = Path('/sys/fs/cgroup')
+PROC_SELF_CGROUP = Path('/proc/self/cgroup')
+UNLIMITED = 1 << 60     # cgroup v1 reports "no limit" as a huge page-aligned number
+
+
+def _read_text(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def cgroup_dirs(controller: Optional[str] = None) -> List[Path]:
+    """
+    This process's cgroup directories in one hierarchy, innermost first up to the
+    mount point: the v2 unified hierarchy, or the v1 hierarchy of `controller`.
+    A limit set on any of them applies, so callers take the smallest.
+
+    The process's path comes from /proc/self/cgroup (`0::/path` for v2,
+    `id:memory:/path` or `id:cpu,cpuacct:/path` for v1). Without a matching
+    entry only the mount point is looked at.
+    """
+    for line in (_read_text(PROC_SELF_CGROUP) or '').splitlines():
+        hierarchy, _, rest = line.partition(':')
+        controllers, _, path = rest.partition(':')
+        if controller is None and hierarchy == '0' and not controllers:
+            mount = CGROUP_ROOT
+        elif controller is not None and controller in controllers.split(','):
+            mount = CGROUP_ROOT / controllers
+        else:
+            continue
+        parts = PurePosixPath(path).parts[1:]
+        return [mount.joinpath(*parts[:depth]) for depth in range(len(parts), -1, -1)]
+    return [CGROUP_ROOT / controller if controller else CGROUP_ROOT]
+
+
+def _read_limit(path: Path) -> Optional[int]:
+    value = _read_text(path)
+    if value is None or value == 'max':
+        return None
+    limit = int(value)
+    return limit if limit < UNLIMITED else None
+
+
+def _read_cpu_max(path: Path) -> Optional[float]:
+    value = _read_text(path)
+    if not value:
+        return None
+    quota, _, period = value.partition(' ')
+    return int(quota) / int(period or 100000) if quota != 'max' else None
+
+
+def _read_cfs_quota(path: Path) -> Optional[float]:
+    quota = _read_text(path / 'cpu.cfs_quota_us')
+    period = _read_text(path / 'cpu.cfs_period_us')
+    return int(quota) / int(period) if quota and period and int(quota) > 0 else None
+
+
+def cgroup_memory_limit() -> Optional[int]:
+    """
+    Memory limit in bytes from cgroup v2 (memory.max) or v1 (memory.limit_in_bytes),
+    None when there isn't one.
+    """
+    limits = [_read_limit(path / 'memory.max') for path in cgroup_dirs()]
+    limits += [_read_limit(path / 'memory.limit_in_bytes') for path in cgroup_dirs('memory')]
+    limits = [limit for limit in limits if limit is not None]
+    return min(limits) if limits else None
+
+
+def cgroup_cpu_limit() -> Optional[float]:
+    """
+    CPU limit in cores from cgroup v2 (cpu.max) or v1 (cfs quota/period), None when there isn't one.
+    """
+    limits = [_read_cpu_max(path / 'cpu.max') for path in cgroup_dirs()]
+    limits += [_read_cfs_quota(path) for path in cgroup_dirs('cpu')]
+    limits = [limit for limit in limits if limit is not None]
+    return min(limits) if limits else None
+
+
+def physical_memory() -> int:
+    return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+
+
+def available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def current_rss() -> int:
+    """
+    Resident set size of this process in bytes, 0 if /proc isn't available.
+    """
+    status = _read_text(Path('/proc/self/status')) or ''
+    for line in status.splitlines():
+        if line.startswith('VmRSS:'):
+            return int(line.split()[1]) * 1024
+    return 0
+
+
+@dataclass(frozen=True)
+class ResourceBudget:
+    memory_limit_bytes: int
+    cpu_limit: float
+    memory_budget_bytes: int
+
+    @staticmethod
+    def detect(memory_fraction: float = 0.8) -> 'ResourceBudget':
+        """
+        Budget from the cgroup limits, falling back to the host's memory/CPUs.
+        Only `memory_fraction` of the limit is handed out, the rest is headroom
+        for the interpreter, libraries and allocator overhead.
+        """
+        memory_limit = min(cgroup_memory_limit() or physical_memory(), physical_memory())
+        cpu_limit = min(cgroup_cpu_limit() or available_cpus(), available_cpus())
+
+        budget = ResourceBudget(
+            memory_limit_bytes=memory_limit,
+            cpu_limit=cpu_limit,
+            memory_budget_bytes=int(memory_limit * memory_fraction),
+        )
+        logger.info(
+            f"Resource budget: {budget.memory_budget_bytes // (1024 * 1024)} MiB of "
+            f"{memory_limit // (1024 * 1024)} MiB, {cpu_limit:g} CPUs"
+        )
+        return budget
+
+    def available_bytes(self) -> int:
+        """
+        What's left of the budget given the current RSS.
+        """
+        return max(self.memory_budget_bytes - current_rss(), 0)
+
+    def chunk_rows(self, bytes_per_row: int, share: float = 0.25, minimum: int = 1000) -> int:
+        """
+        Rows per chunk so one chunk uses at most `share` of the remaining budget.
+        """
+        return max(int(self.available_bytes() * share) // max(bytes_per_row, 1), minimum)
+
+    def worker_count(self, bytes_per_worker: int) -> int:
+        """
+        Parallel workers that fit both the CPU limit and the memory budget.
+        """
+        by_memory = self.memory_budget_bytes // max(bytes_per_worker, 1)
+        return int(max(1, min(int(self.cpu_limit) or 1, by_memory)))
+
+    def spill_threshold_bytes(self, share: float = 0.5) -> int:
+        """
+        How much in-memory data (e.g. datasets) to hold before spilling to disk.
+        """
+        return int(self.memory_budget_bytes * share)
+
+
+class RssMonitor:
+    """
+    Samples the process RSS on a background thread while a block runs and
+    logs a warning when the peak went over the budget.
+
+        with RssMonitor(budget, label='water_ingress'):
+            module.main(context=module_ctx)
+    """
+
+    def __init__(self, budget: ResourceBudget, label: str, interval_seconds: float = 0.5):
+        self.budget = budget
+        self.label = label
+        self.interval_seconds = interval_seconds
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name=f"rss-monitor-{label}", daemon=True)
+
+    def _sample(self) -> None:
+        while True:
+            self.peak_rss = max(self.peak_rss, current_rss())
+            if self._stop.wait(self.interval_seconds):
+                return
+
+    def __enter__(self) -> 'RssMonitor':
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, current_rss())
+
+        peak_mib = self.peak_rss // (1024 * 1024)
+        budget_mib = self.budget.memory_budget_bytes // (1024 * 1024)
+        if self.peak_rss > self.budget.memory_budget_bytes:
+            logger.warning(f"'{self.label}' peaked at {peak_mib} MiB RSS, over the {budget_mib} MiB budget")
+        else:
+            logger.debug(f"'{self.label}' peaked at {peak_mib} MiB RSS (budget {budget_mib} MiB)")
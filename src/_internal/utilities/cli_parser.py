@@ -71,3 +71,30 @@ def get_args():
     )
 
     return parser.parse_args()
+
+def get_batch_args():
+    parser = argparse.ArgumentParser(description='Moonshine Project Batch Runner')
+
+    parser.add_argument(
+        '--config',
+        type=str,
+        default='app-config.toml',
+        help='Path to the shared configuration file (default: app-config.toml)'
+    )
+
+    parser.add_argument(
+        '--manifest',
+        type=str,
+        required=True,
+        help='Path to the site manifest (TOML with one [[sites]] table per site)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of worker processes (default: the cgroup CPU limit, capped by how many '
+             'batch_worker_memory_mb workers fit the memory budget)'
+    )
+
+    return parser.parse_args()
@@ -0,0 +1,386 @@
+"""
+Sidecar byte-range index for large raw CSV files (e.g. CK_S0000088_ATG.csv).
+
+The index maps every (tank key, hour) run of rows to the byte range it occupies in
+the file, so readers can mmap the file and only parse the ranges they need.
+It's stored next to the source as `<file>.idx.npz` and rebuilt whenever the
+source's size or mtime changes.
+
+Assumes one record per line (no quoted newlines), which holds for ATG exports.
+Timestamps are compared in UTC, naive ones (in the file or as bounds) are taken as UTC.
+"""
+import io
+import mmap
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from proj_logging import LoggerFactory
+logger = LoggerFactory.get_logger(name=__name__)
+
+INDEX_SUFFIX = ".idx.npz"
+INDEX_VERSION = 2
+WHITESPACE = np.frombuffer(b' \t\r\n', dtype=np.uint8)
+SCAN_WINDOW_BYTES = 8 << 20     # bytes scanned for line ends at a time
+INDEX_CHUNK_ROWS = 250_000      # rows parsed for keys/hours at a time
+KEY_COLUMNS = ["companyID", "siteID", "TankID"]
+TIME_COLUMN = "ATGRecordDateTime"
+NO_HOUR = np.iinfo(np.int64).min   # rows with an unparseable timestamp
+
+
+def index_path_for(source: Path) -> Path:
+    return source.with_name(source.name + INDEX_SUFFIX)
+
+
+def file_fingerprint(source: Path) -> Dict[str, Any]:
+    """
+    Size and mtime of the file. Any write moves the mtime, so a changed mtime
+    always invalidates the index.
+    """
+    stat = source.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def to_utc(value) -> pd.Timestamp:
+    """
+    A query bound as a UTC timestamp, naive values are taken as UTC.
+    """
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        return timestamp.tz_localize('UTC')
+    return timestamp.tz_convert('UTC')
+
+
+def parse_times(values: pd.Series) -> pd.Series:
+    """
+    ISO 8601 timestamps of any precision/offset as UTC, anything else becomes NaT.
+    """
+    parsed = pd.to_datetime(values, errors="coerce", format="ISO8601", utc=True)
+    return parsed if parsed.dt.tz is not None else parsed.dt.tz_localize('UTC')
+
+
+def tank_keys(frame: pd.DataFrame) -> pd.Series:
+    """
+    `companyID-siteID-TankID` from inferred key columns, the same way the
+    module pipeline builds it from a full parse.
+    """
+    return (frame["companyID"].astype(str) + "-" + frame["siteID"].astype(str)
+            + "-" + frame["TankID"].astype(str))
+
+
+def to_hour(value) -> int:
+    """
+    Hours since the epoch (UTC), the unit the index stores runs in.
+    """
+    return int(to_utc(value).floor('h').value // 3_600_000_000_000)
+
+
+def empty_index(fingerprint: Dict[str, Any], header_end: int) -> Dict[str, Any]:
+    return {
+        "version": INDEX_VERSION,
+        **fingerprint,
+        "header_end": header_end,
+        "keys": np.empty(0, dtype=str),
+        "key": np.empty(0, dtype=np.int32),
+        "hour": np.empty(0, dtype=np.int64),
+        "start": np.empty(0, dtype=np.int64),
+        "end": np.empty(0, dtype=np.int64),
+    }
+
+
+def _scan_lines(mm: mmap.mmap):
+    """
+    (line end offsets, whether each line has non-whitespace content) for the mmapped
+    file, scanned in SCAN_WINDOW_BYTES windows so only one window's temporaries are
+    in memory at a time. A line crossing a window edge carries its content flag over.
+    """
+    ends, content = [], []
+    carry = False   # content of the line still open at the end of the previous window
+    for offset in range(0, len(mm), SCAN_WINDOW_BYTES):
+        window = np.frombuffer(mm, dtype=np.uint8, count=min(SCAN_WINDOW_BYTES, len(mm) - offset), offset=offset)
+        newlines = np.flatnonzero(window == ord('\n'))
+        # segment i ends at newlines[i], the last one is the open tail (possibly empty)
+        segment_starts = np.append(0, newlines + 1)
+        has_tail = segment_starts[-1] < len(window)
+        if not has_tail:
+            segment_starts = segment_starts[:-1]
+        segments = np.logical_or.reduceat(~np.isin(window, WHITESPACE), segment_starts) if len(segment_starts) else \
+            np.empty(0, dtype=bool)
+        del window
+        if len(segments):
+            segments[0] |= carry
+        if len(newlines):
+            ends.append(newlines + 1 + offset)
+            content.append(segments[:len(newlines)])
+            carry = bool(segments[-1]) if has_tail else False
+        else:
+            carry = bool(segments[0]) if has_tail else carry
+
+    if len(mm) and mm[len(mm) - 1] != ord('\n'):
+        ends.append(np.array([len(mm)]))
+        content.append(np.array([carry]))
+    if not ends:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=bool)
+    return np.concatenate(ends).astype(np.int64), np.concatenate(content)
+
+
+def _key_column(values: pd.Series) -> pd.Series:
+    """
+    A key column read as text, with integers in the form a full (int inferring) parse
+    stringifies them in, so `01` in the file matches the pipeline's `1`.
+    """
+    values = values.astype(str)
+    integers = values.str.fullmatch(r"[+-]?\d+")
+    if integers.any():
+        values = values.where(~integers, values[integers].astype(np.int64).astype(str))
+    return values
+
+
+def _chunk_keys(chunk: pd.DataFrame):
+    """
+    (code per row, `companyID-siteID-TankID` key per code) for a chunk of text key columns.
+    Strings are only handled per distinct value, rows are combined as integer codes.
+    """
+    composite = np.zeros(len(chunk), dtype=np.int64)
+    column_codes, column_values = [], []
+    for column in KEY_COLUMNS:
+        codes, uniques = pd.factorize(chunk[column], use_na_sentinel=False)
+        composite = composite * len(uniques) + codes
+        column_codes.append(codes)
+        column_values.append(_key_column(pd.Series(uniques)).to_numpy(dtype=object))
+
+    local_codes, _ = pd.factorize(composite)
+    _, first_rows = np.unique(local_codes, return_index=True)
+    keys = column_values[0][column_codes[0][first_rows]]
+    for codes, values in zip(column_codes[1:], column_values[1:]):
+        keys = keys + "-" + values[codes[first_rows]]
+    return local_codes, pd.Index(keys, dtype=object)
+
+
+def build_index(source: Path) -> Dict[str, Any]:
+    """
+    Scan `source` once and build the byte-range index.
+    Line offsets come from numpy over windows of the mmapped bytes, keys/hours from a
+    chunked usecols-only pandas parse, runs are found without python-level row loops.
+    Besides the current window/chunk, memory is a few integers per line.
+
+    The index is columnar: run i covers bytes [start[i], end[i]) and holds the rows
+    of tank keys[key[i]] during hour[i].
+    """
+    logger.info(f"Building CSV index for {source}")
+    fingerprint = file_fingerprint(source)
+
+    with source.open('rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # pandas skips whitespace-only lines, so they can't be mapped to rows
+        line_ends, has_content = _scan_lines(mm)
+    line_starts = np.append(0, line_ends[:-1])
+    content_lines = np.flatnonzero(has_content)
+    del has_content
+    if len(content_lines) == 0:
+        raise ValueError(f"Cannot index {source}, the file has no header")
+
+    header_end = int(line_ends[content_lines[0]])
+    row_lines = content_lines[1:]
+    if len(row_lines) == 0:
+        return empty_index(fingerprint, header_end)
+    starts, ends = line_starts[row_lines], line_ends[row_lines]
+    del line_starts, line_ends, content_lines, row_lines
+
+    key_codes = np.empty(len(starts), dtype=np.int32)
+    hours = np.empty(len(starts), dtype=np.int64)
+    keys = pd.Index([], dtype=object)
+    rows = 0
+    chunks = pd.read_csv(source, usecols=KEY_COLUMNS + [TIME_COLUMN], dtype=str,
+                         chunksize=INDEX_CHUNK_ROWS)
+    for chunk in chunks:
+        if rows + len(chunk) > len(starts):
+            raise ValueError(f"Cannot index {source}, rows don't map to lines (quoted newlines?)")
+        local_codes, uniques = _chunk_keys(chunk)
+        keys = keys.append(uniques.difference(keys, sort=False))
+        key_codes[rows:rows + len(chunk)] = keys.get_indexer(uniques)[local_codes]
+
+        timestamps = parse_times(chunk[TIME_COLUMN])
+        hours[rows:rows + len(chunk)] = np.where(
+            timestamps.isna(), NO_HOUR,
+            timestamps.dt.floor('h').dt.tz_localize(None).to_numpy(dtype='datetime64[h]').astype(np.int64),
+        )
+        rows += len(chunk)
+    if rows != len(starts):
+        raise ValueError(f"Cannot index {source}, rows don't map to lines (quoted newlines?)")
+
+    # a run starts wherever (key, hour) differs from the previous row
+    run_start = np.ones(rows, dtype=bool)
+    run_start[1:] = (key_codes[1:] != key_codes[:-1]) | (hours[1:] != hours[:-1])
+    first_rows = np.flatnonzero(run_start)
+    last_rows = np.append(first_rows[1:], rows) - 1
+
+    return {
+        "version": INDEX_VERSION,
+        **fingerprint,
+        "header_end": header_end,
+        "keys": np.asarray(keys.astype(str), dtype=str),
+        "key": key_codes[first_rows],
+        "hour": hours[first_rows],
+        "start": starts[first_rows],
+        "end": ends[last_rows],
+    }
+
+
+def load_index(source: Path) -> Dict[str, Any]:
+    """
+    Return a valid index for `source`, rebuilding (and rewriting) the sidecar if it's
+    missing or stale. An unwritable input directory only costs the cache.
+    """
+    sidecar = index_path_for(source)
+    if sidecar.exists():
+        try:
+            with np.load(sidecar, allow_pickle=False) as stored:
+                index = {name: stored[name] for name in stored.files}
+            index = {name: (value.item() if value.ndim == 0 else value) for name, value in index.items()}
+            fingerprint = file_fingerprint(source)
+            if index.get("version") == INDEX_VERSION and all(index[k] == v for k, v in fingerprint.items()):
+                return index
+            logger.info(f"CSV index for {source} is stale, rebuilding")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Unreadable CSV index {sidecar}: {e}")
+
+    index = build_index(source)
+    _write_index(sidecar, index)
+    return index
+
+
+def _write_index(sidecar: Path, index: Dict[str, Any]) -> None:
+    """
+    Write through a uniquely named temp file and an atomic replace, so concurrent
+    writers (batch workers indexing the same raw file) never share a temp file and
+    readers never see a partial sidecar.
+    """
+    tmp_name = None
+    try:
+        with tempfile.NamedTemporaryFile(dir=sidecar.parent, prefix=sidecar.name + ".",
+                                         suffix=".tmp", delete=False) as f:
+            tmp_name = f.name
+            np.savez(f, **index)
+        os.replace(tmp_name, sidecar)
+        logger.debug(f"Wrote CSV index {sidecar}")
+    except OSError as e:
+        logger.warning(f"Could not write CSV index {sidecar}: {e}")
+        if tmp_name is not None:
+            Path(tmp_name).unlink(missing_ok=True)
+
+
+def select_ranges(index: Dict[str, Any], tanks: Optional[Iterable[str]] = None,
+                  start=None, end=None) -> np.ndarray:
+    """
+    Byte ranges, shape (n, 2), covering the requested tanks and [start, end) hours,
+    adjacent ranges merged. Rows with an unparseable timestamp are only returned
+    when no time range is requested.
+    """
+    mask = np.ones(len(index["key"]), dtype=bool)
+    if tanks is not None:
+        wanted = np.flatnonzero(np.isin(index["keys"], list(tanks)))
+        mask &= np.isin(index["key"], wanted)
+    if start is not None or end is not None:
+        mask &= index["hour"] != NO_HOUR
+    if start is not None:
+        mask &= index["hour"] >= to_hour(start)
+    if end is not None:
+        # end is exclusive, an end exactly on the hour doesn't need that hour
+        mask &= index["hour"] <= to_hour(to_utc(end) - pd.Timedelta(1, 'ns'))
+
+    starts, ends = index["start"][mask], index["end"][mask]
+    if len(starts) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    joined = np.ones(len(starts), dtype=bool)
+    joined[1:] = starts[1:] != ends[:-1]
+    group_first = np.flatnonzero(joined)
+    group_last = np.append(group_first[1:], len(starts)) - 1
+    return np.column_stack([starts[group_first], ends[group_last]])
+
+
+def read_ranges(source: Path, index: Dict[str, Any], ranges: np.ndarray) -> pd.DataFrame:
+    """
+    Parse only the given byte ranges (plus the header) through an mmap of the source.
+    """
+    with source.open('rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        chunks = [mm[:index["header_end"]].rstrip(b'\r\n') + b'\n']
+        chunks.extend(mm[start:end] for start, end in ranges.tolist())
+    body = b''.join(chunks)
+    if not body.endswith(b'\n'):
+        body += b'\n'
+    return pd.read_csv(io.BytesIO(body))
+
+
+def read_selection(source: Path, tanks: Optional[Iterable[str]] = None,
+                   start=None, end=None) -> pd.DataFrame:
+    """
+    Rows of `source` for the given tank keys and [start, end) time range.
+    Ranges are hour granular, so the edges are trimmed to the exact timestamps.
+    """
+    index = load_index(source)
+    df = read_ranges(source, index, select_ranges(index, tanks, start, end))
+    if start is not None or end is not None:
+        df = df[time_mask(df, start, end)].reset_index(drop=True)
+    return df
+
+
+def time_mask(df: pd.DataFrame, start=None, end=None) -> pd.Series:
+    """
+    start <= ATGRecordDateTime < end, compared in UTC.
+    """
+    ts = parse_times(df[TIME_COLUMN])
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= ts >= to_utc(start)
+    if end is not None:
+        mask &= ts < to_utc(end)
+    return mask
+
+
+def benchmark(source: Path, tanks: Iterable[str], start=None, end=None, repeat: int = 5) -> Dict[str, float]:
+    """
+    Compare a selective indexed read against a full parse + filter, best of `repeat`, in seconds.
+    """
+    tanks = list(tanks)
+    load_index(source)  # build the sidecar outside the timings
+
+    def full_parse():
+        df = pd.read_csv(source)
+        mask = tank_keys(df).isin(tanks)
+        if start is not None or end is not None:
+            mask &= time_mask(df, start, end)
+        return df[mask]
+
+    def selective():
+        return read_selection(source, tanks, start, end)
+
+    results = {}
+    for name, fn in (("full_parse", full_parse), ("indexed", selective)):
+        timings = []
+        for _ in range(repeat):
+            began = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - began)
+        results[name] = min(timings)
+    results["speedup"] = results["full_parse"] / results["indexed"] if results["indexed"] else float('inf')
+    return results
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark indexed reads against full CSV parses')
+    parser.add_argument('source', type=Path)
+    parser.add_argument('--tanks', nargs='+', required=True, help='tank keys, companyID-siteID-TankID')
+    parser.add_argument('--start', type=str, default=None)
+    parser.add_argument('--end', type=str, default=None)
+    parser.add_argument('--repeat', type=int, default=5)
+    cli_args = parser.parse_args()
+
+    stats = benchmark(cli_args.source, cli_args.tanks, cli_args.start, cli_args.end, cli_args.repeat)
+    print(f"full parse: {stats['full_parse']:.4f}s  indexed: {stats['indexed']:.4f}s  speedup: {stats['speedup']:.1f}x")
@@ -1,7 +1,7 @@
 import logging
 import sys
+from contextlib import contextmanager
 from logging.handlers import TimedRotatingFileHandler
-from src._internal.configs import ProjectPaths
 
 class VerboseFormatter(logging.Formatter):
     def __init__(self):
@@ -23,6 +23,62 @@ class VerboseFormatter(logging.Formatter):
             return self.info_fmt.format(record)
 
 class LoggerFactory:
+    # loggers created while configs was still being imported, they get their file handler later
+    _pending_file_handlers = []
+
+    @staticmethod
+    def attach_file_handlers() -> None:
+        """
+        Add the project.log handler to every logger still waiting for it.
+        configs logs through this module itself, so ProjectPaths is only importable
+        once configs and io_operations have finished loading.
+        """
+        try:
+            from src._internal.configs import ProjectPaths
+        except ImportError:
+            return
+
+        pending, LoggerFactory._pending_file_handlers = LoggerFactory._pending_file_handlers, []
+        for logger in pending:
+            project_paths = ProjectPaths.create()
+            log_file = project_paths.logs / "project.log"
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+
+            file_handler = TimedRotatingFileHandler(
+                filename=log_file,
+                when="midnight",
+                backupCount=90,
+                encoding="utf-8",
+                utc=True
+            )
+            file_handler.setFormatter(VerboseFormatter())
+            file_handler.setLevel(logging.DEBUG)  # capture more detail in file
+            logger.addHandler(file_handler)
+
+            logger.info(f"Logger initialized for {logger.name}. Logs will go to: {log_file}")
+
+    @staticmethod
+    @contextmanager
+    def context(label: str):
+        """
+        Prefix every record logged inside the block with `[label]`, whichever logger it
+        goes through. Used by the batch runner to tag module logs with the site name.
+        """
+        factory = logging.getLogRecordFactory()
+
+        def record_factory(*args, **kwargs):
+            record = factory(*args, **kwargs)
+            # %-escaped when the message still gets %-formatted with args
+            prefix = f"[{label}] " if not record.args else f"[{label.replace('%', '%%')}] "
+            record.msg = prefix + str(record.msg)
+            return record
+
+        logging.setLogRecordFactory(record_factory)
+        try:
+            yield
+        finally:
+            logging.setLogRecordFactory(factory)
+
     @staticmethod
     def get_logger(name=__name__, level=logging.INFO) -> logging.Logger:
         logger = logging.getLogger(name)
@@ -40,21 +96,7 @@ class LoggerFactory:
             logger.addHandler(console_handler)
 
             # File handler
-            project_paths = ProjectPaths.create()
-            log_file = project_paths.logs / "project.log"
-            log_file.parent.mkdir(parents=True, exist_ok=True)
-
-            file_handler = TimedRotatingFileHandler(
-                filename=log_file,
-                when="midnight",
-                backupCount=90,
-                encoding="utf-8",
-                utc=True
-            )
-            file_handler.setFormatter(formatter)
-            file_handler.setLevel(logging.DEBUG)  # capture more detail in file
-            logger.addHandler(file_handler)
-
-            logger.info(f"Logger initialized for {name}. Logs will go to: {log_file}")
+            LoggerFactory._pending_file_handlers.append(logger)
 
+        LoggerFactory.attach_file_handlers()
         return logger
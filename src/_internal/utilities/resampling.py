@@ -0,0 +1,258 @@
+"""
+Regular-grid resampling of per-tank readings (e.g. ATG snapshots every `time_interval` minutes).
+
+All tanks are resampled in one pass: readings are sorted on a composite
+(tank, time) key, and every grid point finds its surrounding readings with a single
+np.searchsorted, no per-tank loops.
+
+Grid points are multiples of the interval since the epoch, so 30 minutes gives :00 and :30.
+Timezones are kept: tz-aware readings come back on a grid in the same timezone (mixed
+offsets in UTC), naive readings on a naive grid.
+"""
+from dataclasses import dataclass, field
+from datetime import timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+KEY_COLUMNS = ["companyID", "siteID", "TankID"]
+TIME_COLUMN = "ATGRecordDateTime"
+METHODS = ("last", "linear")
+OFFSET_PATTERN = r"(Z|[+-]\d{2}:?\d{2})$"
+
+
+def _grid_values(codes, seconds, values, grid_codes, grid_seconds, method, max_gap_seconds):
+    """
+    Core of the engine. codes/seconds/values are the readings sorted by (code, seconds),
+    grid_codes/grid_seconds the points to fill. Returns a (len(grid), n_values) array.
+
+    last:   value of the latest reading at or before the point, NaN if it's older than max_gap.
+    linear: interpolated between the readings around the point, NaN if they're further
+            apart than max_gap (an exact hit is always returned as is).
+    """
+    span = int(max(seconds.max(), grid_seconds.max()) - min(seconds.min(), grid_seconds.min())) + 1
+    origin = min(seconds.min(), grid_seconds.min())
+    composite = codes.astype(np.int64) * span + (seconds - origin)
+    queries = grid_codes.astype(np.int64) * span + (grid_seconds - origin)
+
+    prev_idx = np.searchsorted(composite, queries, side="right") - 1
+    has_prev = (prev_idx >= 0) & (codes[np.clip(prev_idx, 0, None)] == grid_codes)
+    prev_idx = np.clip(prev_idx, 0, None)
+    prev_seconds = seconds[prev_idx]
+
+    result = np.full((len(grid_codes), values.shape[1]), np.nan)
+
+    if method == "last":
+        ok = has_prev
+        if max_gap_seconds is not None:
+            ok &= (grid_seconds - prev_seconds) <= max_gap_seconds
+        result[ok] = values[prev_idx[ok]]
+        return result
+
+    next_idx = np.clip(prev_idx + 1, 0, len(codes) - 1)
+    exact = has_prev & (prev_seconds == grid_seconds)
+    has_next = has_prev & (next_idx > prev_idx) & (codes[next_idx] == grid_codes)
+    between = has_next & ~exact
+    if max_gap_seconds is not None:
+        between &= (seconds[next_idx] - prev_seconds) <= max_gap_seconds
+
+    result[exact] = values[prev_idx[exact]]
+    weight = ((grid_seconds - prev_seconds) / np.maximum(seconds[next_idx] - prev_seconds, 1))[between, None]
+    result[between] = values[prev_idx[between]] + weight * (values[next_idx[between]] - values[prev_idx[between]])
+    return result
+
+
+def _parse_times(values: pd.Series) -> pd.Series:
+    """
+    ISO 8601 timestamps, anything else becomes NaT. Mixed offsets (or naive mixed
+    with aware values) can't share a timezone and are converted to UTC.
+
+    Parsing is always done in UTC, pandas versions disagree on what a mixed-offset
+    parse without it returns. The offset of the valid values is read off the strings
+    separately, and the result is converted back only when they all share one.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    parsed = pd.to_datetime(values, errors="coerce", format="ISO8601", utc=True)
+    # an offset is at most the last 6 characters, only the distinct tails are matched
+    tails = pd.Series(values[parsed.notna()].astype(str).str.strip().str[-6:].unique(), dtype=object)
+    offsets = (tails.str.extract(OFFSET_PATTERN, expand=False)
+               .str.replace(":", "", regex=False).replace("Z", "+0000"))
+    if offsets.isna().all():
+        return parsed.dt.tz_localize(None)
+    shared = offsets.unique()
+    if len(shared) == 1 and offsets.notna().all():
+        return parsed.dt.tz_convert(_fixed_offset(shared[0]))
+    return parsed
+
+
+def _fixed_offset(offset: str):
+    """
+    '+0200' -> the UTC+02:00 timezone pandas gives ISO 8601 offsets.
+    """
+    minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+    if minutes == 0:
+        return "UTC"
+    return timezone(timedelta(minutes=-minutes if offset[0] == "-" else minutes))
+
+
+def _expand_grid(first: np.ndarray, last: np.ndarray, interval_seconds: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For per-key [first, last] grid bounds, the flat (key code, grid seconds) pairs.
+    """
+    counts = np.maximum((last - first) // interval_seconds + 1, 0)
+    grid_codes = np.repeat(np.arange(len(first)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    grid_seconds = np.repeat(first, counts) + offsets * interval_seconds
+    return grid_codes, grid_seconds
+
+
+def resample(
+    readings: pd.DataFrame,
+    value_columns: List[str],
+    interval_minutes: int,
+    method: str = "last",
+    max_gap_minutes: Optional[int] = None,
+    start=None,
+    end=None,
+    key_columns: List[str] = KEY_COLUMNS,
+    time_column: str = TIME_COLUMN,
+) -> pd.DataFrame:
+    """
+    Align per-tank readings to a fixed grid.
+
+    Without start/end every tank gets the grid points between its first and last reading,
+    with them all tanks share [start, end]. Returns one row per (tank, grid point):
+    key_columns, time_column (the grid time) and value_columns.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown resampling method '{method}', expected one of {METHODS}")
+
+    interval_seconds = int(interval_minutes * 60)
+    max_gap_seconds = int(max_gap_minutes * 60) if max_gap_minutes is not None else None
+
+    timestamps = _parse_times(readings[time_column])
+    readings = readings.loc[timestamps.notna()].assign(**{time_column: timestamps[timestamps.notna()]})
+    if readings.empty:
+        return pd.DataFrame(columns=key_columns + [time_column] + value_columns)
+
+    # the grid is computed on UTC seconds and put back in the readings' timezone at the end
+    tz = readings[time_column].dt.tz
+    utc_times = readings[time_column].dt.tz_convert("UTC").dt.tz_localize(None) if tz else readings[time_column]
+    codes, keys = pd.factorize(pd.MultiIndex.from_frame(readings[key_columns]))
+    seconds = utc_times.to_numpy(dtype="datetime64[s]").astype(np.int64)
+    order = np.lexsort((seconds, codes))
+    codes, seconds = codes[order], seconds[order]
+    values = readings[value_columns].to_numpy(dtype=float)[order]
+
+    if start is not None or end is not None:
+        first_default = -(-seconds.min() // interval_seconds) * interval_seconds
+        last_default = seconds.max() // interval_seconds * interval_seconds
+        grid_start = _to_seconds(start, tz, ceil_to=interval_seconds) if start is not None else first_default
+        grid_end = _to_seconds(end, tz, floor_to=interval_seconds) if end is not None else last_default
+        first = np.full(len(keys), grid_start)
+        last = np.full(len(keys), grid_end)
+    else:
+        bounds = pd.DataFrame({"code": codes, "seconds": seconds}).groupby("code")["seconds"].agg(["min", "max"])
+        first = -(-bounds["min"].to_numpy() // interval_seconds) * interval_seconds
+        last = bounds["max"].to_numpy() // interval_seconds * interval_seconds
+
+    grid_codes, grid_seconds = _expand_grid(first, last, interval_seconds)
+    if len(grid_codes) == 0:
+        return pd.DataFrame(columns=key_columns + [time_column] + value_columns)
+
+    grid_values = _grid_values(codes, seconds, values, grid_codes, grid_seconds, method, max_gap_seconds)
+
+    result = keys.to_frame(index=False, name=key_columns).iloc[grid_codes].reset_index(drop=True)
+    grid_times = pd.to_datetime(grid_seconds, unit="s", utc=tz is not None)
+    result[time_column] = grid_times.tz_convert(tz) if tz else grid_times
+    result[value_columns] = grid_values
+    return result
+
+
+def to_dense(resampled: pd.DataFrame, value_column: str, key_columns: List[str] = KEY_COLUMNS,
+             time_column: str = TIME_COLUMN) -> Tuple[pd.MultiIndex, pd.DatetimeIndex, np.ndarray]:
+    """
+    (tank keys, grid times, values[tank, time]) for one value column of a resample() result.
+    """
+    table = resampled.pivot_table(index=key_columns, columns=time_column, values=value_column,
+                                  aggfunc="first", dropna=False)
+    return table.index, pd.DatetimeIndex(table.columns), table.to_numpy(dtype=float)
+
+
+def _to_seconds(value, tz=None, ceil_to: Optional[int] = None, floor_to: Optional[int] = None) -> int:
+    """
+    Epoch seconds of a grid bound, a naive bound is taken in the readings' timezone `tz`.
+    """
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None and tz is not None:
+        timestamp = timestamp.tz_localize(tz)
+    seconds = int(timestamp.value // 1_000_000_000)
+    if ceil_to:
+        return -(-seconds // ceil_to) * ceil_to
+    if floor_to:
+        return seconds // floor_to * floor_to
+    return seconds
+
+
+@dataclass
+class GridResampler:
+    """
+    Incremental resample(): feed readings as they arrive with extend(), get back the grid
+    points that are final. A point is final once the tank has a reading at or after it,
+    later readings can't change it (readings are assumed to arrive in time order per tank).
+
+    The last reading of each tank is carried over, so values and gaps are continuous
+    across batches.
+    """
+    value_columns: List[str]
+    interval_minutes: int
+    method: str = "last"
+    max_gap_minutes: Optional[int] = None
+    key_columns: List[str] = field(default_factory=lambda: list(KEY_COLUMNS))
+    time_column: str = TIME_COLUMN
+    _carry: Optional[pd.DataFrame] = field(default=None, repr=False)
+    _next_grid: Optional[pd.DataFrame] = field(default=None, repr=False)
+
+    @staticmethod
+    def from_config(config: Dict[str, Any], value_columns: List[str]) -> 'GridResampler':
+        """
+        Build from a module config section (`time_interval`, `resample_method`, `max_gap_minutes`).
+        """
+        return GridResampler(
+            value_columns=value_columns,
+            interval_minutes=config["time_interval"],
+            method=config.get("resample_method", "last"),
+            max_gap_minutes=config.get("max_gap_minutes"),
+        )
+
+    def extend(self, readings: pd.DataFrame) -> pd.DataFrame:
+        columns = self.key_columns + [self.time_column] + self.value_columns
+        readings = readings[columns].assign(
+            **{self.time_column: _parse_times(readings[self.time_column])})
+        if self._carry is not None:
+            readings = pd.concat([self._carry, readings], ignore_index=True)
+
+        resampled = resample(
+            readings, self.value_columns, self.interval_minutes, self.method, self.max_gap_minutes,
+            key_columns=self.key_columns, time_column=self.time_column,
+        )
+
+        # drop the points already emitted by an earlier extend()
+        if self._next_grid is not None and not resampled.empty:
+            resampled = resampled.merge(self._next_grid, on=self.key_columns, how="left")
+            fresh = resampled["_next_grid"].isna() | (resampled[self.time_column] >= resampled["_next_grid"])
+            resampled = resampled[fresh].drop(columns="_next_grid").reset_index(drop=True)
+
+        latest = readings.dropna(subset=[self.time_column]).sort_values(self.time_column)
+        self._carry = latest.groupby(self.key_columns, sort=False).tail(1).reset_index(drop=True)
+
+        if not resampled.empty:
+            step = pd.Timedelta(minutes=self.interval_minutes)
+            next_grid = resampled.groupby(self.key_columns, as_index=False)[self.time_column].max()
+            next_grid = next_grid.rename(columns={self.time_column: "_next_grid"})
+            next_grid["_next_grid"] += step
+            self._next_grid = pd.concat([next_grid, self._next_grid]).drop_duplicates(
+                subset=self.key_columns, keep="first").reset_index(drop=True)
+        return resampled
@@ -0,0 +1,39 @@
+import sys
+import logging
+from pathlib import Path
+
+from src._internal.batch_executor import execute_sites
+from src._internal.load_config import load_manifest, read_toml_config
+from src._internal.utilities.cli_parser import get_batch_args
+
+from src._internal.utilities.proj_logging import LoggerFactory
+logger = LoggerFactory.get_logger(
+    name="batch",
+    level=logging.DEBUG,
+)
+
+
+def main(args=None):
+    """
+    Runs the module pipeline for every site in a manifest on a shared worker pool.
+    The shared config is read once here and handed to the workers.
+    """
+    config_data = read_toml_config(Path(args.config).resolve())
+    sites = load_manifest(args.manifest)
+
+    logger.info(f'Using config: {args.config}, manifest: {args.manifest}')
+    results = execute_sites(sites, config_data, max_workers=args.workers)
+
+    failed = sum(not result.succeeded for result in results)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main_args = get_batch_args()
+    try:
+        main(main_args)
+    except Exception as e:
+        logger.error(f'Batch failed: {e}')
+        sys.exit(1)
+    finally:
+        logger.info('The batch has completed')
@@ -1,6 +1,10 @@
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Optional
+
+from src._internal.dataset_registry import DatasetRegistry
+from src._internal.utilities.csv_index import read_selection
 
 
 class DataFetcher:
@@ -8,32 +12,50 @@ class DataFetcher:
     fast-failing
 
     Fetches pre-hour close data and hourly ATG observation data for the water_ingress module.
-    Data must be provided as CSV files in the input path.
+    Data comes from the `pre_result` / `atg_result` datasets when an earlier module
+    published them, otherwise it must be provided as CSV files in the input path.
     """
 
     @staticmethod
-    def get_pre_result(current_time: datetime, input_path: Path):
+    def get_pre_result(current_time: datetime, input_path: Path, datasets: Optional[DatasetRegistry] = None):
         """
-        Load pre-hour close data from pre_result.csv.
+        Load pre-hour close data from the pre_result dataset or pre_result.csv.
         """
-        input_file = input_path / "pre_result.csv"
-        if not input_file.exists():
-            raise FileNotFoundError(f"Expected pre_result.csv at {input_file}")
-
-        df = pd.read_csv(input_file)
-        return {"pre_obs_result": df.to_dict(orient="records")}
+        if datasets is not None and datasets.has("pre_result"):
+            df = datasets.get("pre_result")
+        else:
+            input_file = input_path / "pre_result.csv"
+            if not input_file.exists():
+                raise FileNotFoundError(f"Expected pre_result.csv at {input_file}")
+            df = pd.read_csv(input_file)
+        return {"pre_obs_result": df}
 
     @staticmethod
-    def get_atg_result(current_time: datetime, input_path: Path):
+    def get_atg_result(current_time: datetime, input_path: Path, datasets: Optional[DatasetRegistry] = None):
         """
-        Load hourly ATG observation data from atg_result.csv.
+        Load hourly ATG observation data from the atg_result dataset or atg_result.csv.
         """
-        input_file = input_path / "atg_result.csv"
-        if not input_file.exists():
-            raise FileNotFoundError(f"Expected atg_result.csv at {input_file}")
-
-        df = pd.read_csv(input_file)
+        if datasets is not None and datasets.has("atg_result"):
+            df = datasets.get("atg_result")
+        else:
+            input_file = input_path / "atg_result.csv"
+            if not input_file.exists():
+                raise FileNotFoundError(f"Expected atg_result.csv at {input_file}")
+            df = pd.read_csv(input_file)
         return {
             "last_hour_start": current_time.replace(minute=0, second=0, microsecond=0).isoformat(),
-            "atg_result": df.to_dict(orient="records"),
+            "atg_result": df,
         }
+
+    @staticmethod
+    def get_atg_readings(input_file: Path, tanks: Optional[Iterable[str]] = None,
+                         start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Load raw ATG readings (e.g. CK_S0000088_ATG.csv) for a set of tanks
+        (`companyID-siteID-TankID` keys) and a [start, end) time range.
+        Only the matching byte ranges are read, via the file's sidecar index.
+        """
+        if not input_file.exists():
+            raise FileNotFoundError(f"Expected ATG readings at {input_file}")
+
+        return read_selection(input_file, tanks=tanks, start=start, end=end)
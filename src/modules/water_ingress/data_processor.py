@@ -11,6 +11,9 @@ use `from common import Config as cfg` instead
 import copy
 import statistics
 
+import numpy as np
+import pandas as pd
+
 
 class DataProcessor:
 
@@ -42,6 +45,29 @@ class DataProcessor:
 
         return pre_dict
 
+    @staticmethod
+    def tank_batches(atg_df: pd.DataFrame, batch_rows: int):
+        """
+        Split atg_result into batches of whole tanks of roughly `batch_rows` rows, so
+        build_obs_result can run batch by batch on records without every row being a
+        python dict at once. A tank is never split, a tank above `batch_rows` is a batch of its own.
+        """
+        if len(atg_df) <= batch_rows:
+            yield atg_df
+            return
+
+        key = (atg_df["companyID"].astype(str) + "-" + atg_df["siteID"].astype(str)
+               + "-" + atg_df["TankID"].astype(str))
+        codes, _ = pd.factorize(key)
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes)
+        # a tank goes into the batch its first row falls in
+        tank_batch = (np.cumsum(counts) - counts) // batch_rows
+        row_batch = tank_batch[codes[order]]
+        bounds = np.flatnonzero(np.diff(row_batch)) + 1
+        for rows in np.split(order, bounds):
+            yield atg_df.iloc[rows]
+
     # pylint: disable=too-many-locals
     @staticmethod
     def build_obs_result(atg_result, pre_dict, last_hour_start):
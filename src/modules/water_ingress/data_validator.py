@@ -0,0 +1,237 @@
+
+"""
+- Runs before DataProcessor, on whole batches at once (no per-row python loops)
+- `strict` mode keeps the old fast-fail behaviour, `quarantine` drops bad rows instead
+"""
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+TANK_KEY_COLUMNS = ["companyID", "siteID", "TankID"]
+LEVEL_COLUMNS = ["WaterLevelCurrent", "ProductLevelCurrent", "ProductVolumeCurrent"]
+PRE_COLUMNS = [
+    "PK", "CloseATGRecordID", "CloseATGRecordDateTime", "CloseWaterLevelCurrent",
+    "CloseProductLevelCurrent", "CloseProductVolumeCurrent", "CloseProductTemperatureCurrent",
+]
+ATG_COLUMNS = TANK_KEY_COLUMNS + [
+    "GradeID", "ATGRecordID", "ATGRecordDateTime", "ProductTemperatureCurrent",
+] + LEVEL_COLUMNS
+
+# row level issues, every one of these quarantines the row
+ROW_ISSUES = [
+    "duplicate_record",
+    "unparseable_timestamp",
+    "out_of_order_timestamp",
+    "invalid_level",
+    "water_above_product",
+]
+PRE_ISSUES = ["pre_duplicate_record", "pre_unparseable_timestamp"]
+REPORT_COLUMNS = (TANK_KEY_COLUMNS + ["rows", "valid_rows", "quarantined"] + ROW_ISSUES + PRE_ISSUES
+                  + ["gaps", "max_gap_minutes"])
+
+VALIDATION_MODES = ("strict", "quarantine")
+
+
+class DataValidator:
+
+    """
+    Vectorized data-quality checks for pre_result / atg_result batches.
+    """
+
+    @staticmethod
+    def tank_key(df: pd.DataFrame) -> pd.Series:
+        """
+        Same `companyID-siteID-TankID` key DataProcessor and pre_result.PK use.
+        """
+        return (
+            df["companyID"].astype(str) + "-"
+            + df["siteID"].astype(str) + "-"
+            + df["TankID"].astype(str)
+        )
+
+    @staticmethod
+    def tank_codes(df: pd.DataFrame):
+        """
+        (integer tank code per row, tank key per code). Grouping on the codes is much
+        cheaper than on a per-row key string, which is only built once per tank.
+        """
+        codes = df.groupby(TANK_KEY_COLUMNS, sort=False, dropna=False).ngroup().to_numpy()
+        # ngroup(sort=False) numbers tanks in order of first appearance, as drop_duplicates keeps them
+        keys = DataValidator.tank_key(df[TANK_KEY_COLUMNS].drop_duplicates())
+        return codes, pd.Index(keys)
+
+    @staticmethod
+    def parse_timestamps(values: pd.Series) -> pd.Series:
+        """
+        ISO 8601 timestamps of any precision/offset as UTC, naive values are taken as UTC.
+        Anything that isn't ISO 8601 becomes NaT.
+        """
+        parsed = pd.to_datetime(values, errors="coerce", format="ISO8601", utc=True)
+        # empty or all-missing input comes back naive
+        return parsed if parsed.dt.tz is not None else parsed.dt.tz_localize("UTC")
+
+    @staticmethod
+    def format_timestamps(timestamps: pd.Series) -> pd.Series:
+        """
+        UTC timestamps as ISO 8601 with offset, with microseconds when any value in the
+        batch has sub-seconds. All values share the UTC offset and precision, so the
+        strings compare in time order.
+        """
+        values = timestamps.dt.tz_convert(None).to_numpy(dtype="datetime64[ns]")
+        # whole seconds unless the batch has sub-seconds; strftime is ~15x slower
+        unit = "us" if (values.astype(np.int64) % 1_000_000_000).any() else "s"
+        return pd.Series(np.char.add(np.datetime_as_string(values, unit=unit), "+00:00"),
+                         index=timestamps.index, dtype=object)
+
+    @staticmethod
+    def flag_pre_result(pre_df: pd.DataFrame, close_ts: pd.Series) -> pd.DataFrame:
+        """
+        Flag pre_result rows. Every row sharing a duplicated PK is flagged, there is
+        no way of telling which close is the right one.
+        """
+        return pd.DataFrame({
+            "duplicate_record": pre_df["PK"].duplicated(keep=False),
+            "unparseable_timestamp": close_ts.isna(),
+        }, index=pre_df.index)
+
+    @staticmethod
+    def flag_atg_result(atg_df: pd.DataFrame, codes: np.ndarray, keys: pd.Index, ts: pd.Series,
+                        pre_close: pd.Series, max_level=None) -> pd.DataFrame:
+        """
+        Flag atg_result rows, one boolean column per issue in ROW_ISSUES.
+        `pre_close` maps tank key -> previous hour close timestamp; readings older than
+        the close (or older than an earlier reading of the same tank) are out of order.
+        """
+        # running max of the *previous* readings per tank, in file order; cummax is NaT on
+        # unparseable rows, so it's carried forward over them before the shift
+        prior_max = ts.groupby(codes).cummax().groupby(codes).ffill().groupby(codes).shift()
+        prior_max = prior_max.fillna(pd.Series(pre_close.reindex(keys).array.take(codes), index=ts.index))
+
+        levels = atg_df[LEVEL_COLUMNS].apply(pd.to_numeric, errors="coerce")
+        invalid_level = levels.isna().any(axis=1) | (levels < 0).any(axis=1)
+        if max_level is not None:
+            height = levels[["WaterLevelCurrent", "ProductLevelCurrent"]]
+            invalid_level |= (height > max_level).any(axis=1)
+
+        return pd.DataFrame({
+            "duplicate_record": pd.DataFrame({"_code": codes, "_id": atg_df["ATGRecordID"].to_numpy()},
+                                             index=atg_df.index).duplicated(keep="first"),
+            "unparseable_timestamp": ts.isna(),
+            "out_of_order_timestamp": (ts < prior_max).to_numpy(),
+            "invalid_level": invalid_level,
+            "water_above_product": levels["WaterLevelCurrent"] > levels["ProductLevelCurrent"],
+        }, index=atg_df.index)
+
+    @staticmethod
+    def find_gaps(codes: np.ndarray, keys: pd.Index, ts: pd.Series, expected_interval_minutes) -> pd.DataFrame:
+        """
+        Per tank gap statistics over the parseable readings, sorted by time.
+        A gap is any step between consecutive readings above the expected interval.
+        """
+        readings = pd.DataFrame({"_code": codes, "_ts": ts.array}).dropna(subset=["_ts"])
+        readings = readings.sort_values(["_code", "_ts"])
+        step = readings.groupby("_code")["_ts"].diff().dt.total_seconds() / 60
+        readings = readings.assign(
+            _step=step,
+            _gap=step > expected_interval_minutes,
+        )
+        gaps = readings.groupby("_code").agg(
+            gaps=("_gap", "sum"),
+            max_gap_minutes=("_step", "max"),
+        )
+        return gaps.set_axis(keys[gaps.index])
+
+    @staticmethod
+    def build_quality_report(codes: np.ndarray, keys: pd.Index, flags: pd.DataFrame, gaps: pd.DataFrame,
+                             pre_flags_by_key: pd.DataFrame) -> pd.DataFrame:
+        """
+        One row per tank: row counts, per-issue counts and gap statistics.
+        """
+        counts = flags.astype(int).assign(
+            _code=codes,
+            rows=1,
+            quarantined=flags.any(axis=1).astype(int),
+        ).groupby("_code").sum()
+        counts = counts.set_axis(keys[counts.index])
+
+        report = counts.join(gaps, how="left").join(pre_flags_by_key, how="outer")
+        report = report.reindex(columns=[c for c in REPORT_COLUMNS if c not in TANK_KEY_COLUMNS + ["valid_rows"]])
+        int_columns = ["rows", "quarantined", "gaps"] + ROW_ISSUES + PRE_ISSUES
+        report[int_columns] = report[int_columns].fillna(0).astype(int)
+        report["valid_rows"] = report["rows"] - report["quarantined"]
+
+        keys = report.index.to_series().astype(str).str.split("-", n=2, expand=True)
+        keys = keys.reindex(columns=range(3))
+        keys.columns = TANK_KEY_COLUMNS
+        report = pd.concat([keys, report], axis=1).reset_index(drop=True)
+        return report[REPORT_COLUMNS]
+
+    @staticmethod
+    def validate_frames(pre_df: pd.DataFrame, atg_df: pd.DataFrame, config,
+                        report_path: Optional[Path] = None):
+        """
+        Validates pre_result / atg_result frames before processing.
+
+        config (module section):
+            validation_mode: 'strict' (default) raises ValueError on any bad row,
+                             'quarantine' drops the bad rows and carries on.
+            expected_interval_minutes: readings further apart than this are reported as gaps.
+            max_level: optional upper bound for water/product levels.
+
+        The quality report is written to `report_path` (if given) before a strict
+        failure is raised. Timestamps come back as UTC ISO 8601 strings so the string
+        comparisons in DataProcessor.build_obs_result order them correctly.
+
+        Returns (pre_df, atg_df, quality_report).
+        """
+        mode = config.get("validation_mode", "strict")
+        if mode not in VALIDATION_MODES:
+            raise ValueError(f"Unknown validation_mode '{mode}', expected one of {VALIDATION_MODES}")
+
+        # an hour without readings, or a first run without a previous close, is valid
+        if pre_df.empty:
+            pre_df = pre_df.reindex(columns=pre_df.columns.union(PRE_COLUMNS, sort=False))
+        if atg_df.empty:
+            atg_df = atg_df.reindex(columns=atg_df.columns.union(ATG_COLUMNS, sort=False))
+
+        close_ts = DataValidator.parse_timestamps(pre_df["CloseATGRecordDateTime"])
+        pre_flags = DataValidator.flag_pre_result(pre_df, close_ts)
+        bad_pre = pre_flags.any(axis=1)
+        pre_close = close_ts[~bad_pre].set_axis(pre_df.loc[~bad_pre, "PK"])
+
+        codes, keys = DataValidator.tank_codes(atg_df)
+        ts = DataValidator.parse_timestamps(atg_df["ATGRecordDateTime"])
+
+        flags = DataValidator.flag_atg_result(atg_df, codes, keys, ts, pre_close, config.get("max_level"))
+        gaps = DataValidator.find_gaps(codes, keys, ts, config.get("expected_interval_minutes", 15))
+        pre_flags_by_key = pre_flags.astype(int).groupby(pre_df["PK"]).sum().add_prefix("pre_")
+
+        report = DataValidator.build_quality_report(codes, keys, flags, gaps, pre_flags_by_key)
+        if report_path is not None:
+            report.to_csv(report_path, index=False)
+
+        bad_atg = flags.any(axis=1)
+        if mode == "strict" and (bad_atg.any() or bad_pre.any()):
+            issues = {
+                **{name: int(count) for name, count in flags.sum().items() if count},
+                **{f"pre_{name}": int(count) for name, count in pre_flags.sum().items() if count},
+            }
+            raise ValueError(f"Input validation failed: {issues}")
+
+        pre_df = pre_df[~bad_pre].assign(
+            CloseATGRecordDateTime=DataValidator.format_timestamps(close_ts[~bad_pre]))
+        atg_df = atg_df[~bad_atg].assign(
+            ATGRecordDateTime=DataValidator.format_timestamps(ts[~bad_atg]))
+        return pre_df, atg_df, report
+
+    @staticmethod
+    def validate(pre_data, atg_data, config, report_path: Optional[Path] = None):
+        """
+        validate_frames() for the payloads DataFetcher produces, returned in the same shape.
+        """
+        pre_df, atg_df, report = DataValidator.validate_frames(
+            pre_data["pre_obs_result"], atg_data["atg_result"], config, report_path)
+        return {**pre_data, "pre_obs_result": pre_df}, {**atg_data, "atg_result": atg_df}, report
@@ -3,6 +3,7 @@ import pandas as pd
 
 from data_fetcher import DataFetcher
 from data_processor import DataProcessor
+from data_validator import DataValidator
 from src._internal.context import ModuleExecutionContext
 
 def main(context: ModuleExecutionContext):
@@ -13,8 +14,9 @@ def main(context: ModuleExecutionContext):
     Main entry point for the water_ingress module.
     Steps:
     1. Fetch raw data.
-    2. Process the data.
-    3. Save the processed result to a CSV.
+    2. Validate the data (strict: fail, quarantine: drop bad rows).
+    3. Process the data.
+    4. Save the processed result and the data-quality report to CSV.
     """
 
     input_path = context.input_path
@@ -25,19 +27,37 @@ def main(context: ModuleExecutionContext):
     utc_now = datetime.now(timezone.utc)
 
     # Step 1: Fetch data
-    pre_data = DataFetcher.get_pre_result(utc_now, input_path)
-    atg_data = DataFetcher.get_atg_result(utc_now, input_path)
-
-    # Step 2: Process data
-    processed_pre_data = DataProcessor.process_pre_result(pre_data)
-    observations = DataProcessor.build_obs_result(
-        atg_result=atg_data["atg_result"],
-        pre_dict=processed_pre_data,
-        last_hour_start=atg_data["last_hour_start"]
-    )
-
-    # Step 3: Save results as a CSV
+    pre_data = DataFetcher.get_pre_result(utc_now, input_path, context.datasets)
+    atg_data = DataFetcher.get_atg_result(utc_now, input_path, context.datasets)
+
+    # Step 2: Validate data
+    # the report is written even when strict validation fails
+    pre_data, atg_data, quality_report = DataValidator.validate(
+        pre_data, atg_data, config, report_path=output_path / "water_ingress_quality_report.csv")
+
+    # Step 3: Process data, in batches of whole tanks sized to the memory budget
+    processed_pre_data = DataProcessor.process_pre_result(
+        {"pre_obs_result": pre_data["pre_obs_result"].to_dict(orient="records")})
+    atg_df = atg_data["atg_result"]
+    batch_rows = len(atg_df) or 1
+    if context.resources is not None:
+        # rough size of a row as python records, ~10x the DataFrame row
+        bytes_per_row = 10 * int(atg_df.memory_usage(deep=True).sum()) // max(len(atg_df), 1)
+        batch_rows = context.resources.chunk_rows(bytes_per_row)
+
+    observations = []
+    for batch in DataProcessor.tank_batches(atg_df, batch_rows):
+        observations.extend(DataProcessor.build_obs_result(
+            atg_result=batch.to_dict(orient="records"),
+            pre_dict=processed_pre_data,
+            last_hour_start=atg_data["last_hour_start"]
+        ))
+
+    # Step 4: Save results as a CSV, and hand them to later modules in memory
     output_file = output_path / "water_ingress_observations.csv"
-    pd.DataFrame(observations).to_csv(output_file, index=False)
+    observations_df = pd.DataFrame(observations)
+    observations_df.to_csv(output_file, index=False)
+    if context.datasets is not None:
+        context.datasets.publish("water_ingress_observations", observations_df)
 
     print(f"[water_ingress] Processing complete. Output saved to {output_file}")
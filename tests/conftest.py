@@ -0,0 +1,19 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# the app runs with these directories on the path (see the bare imports in src/)
+ROOT = Path(__file__).resolve().parent.parent
+for path in (
+    ROOT,
+    ROOT / "src",
+    ROOT / "src" / "_internal",
+    ROOT / "src" / "_internal" / "utilities",
+    ROOT / "src" / "modules" / "water_ingress",
+):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+# keep the log files out of the repository
+os.environ.setdefault("PROJECT_ROOT", tempfile.mkdtemp(prefix="bulls-and-bear-tests-"))
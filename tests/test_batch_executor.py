@@ -0,0 +1,92 @@
+import logging
+import logging.handlers
+from pathlib import Path
+
+import pytest
+
+from configs import SiteSpec
+from src._internal import batch_executor
+from src._internal.batch_executor import SiteResult, execute_site, log_fleet_summary
+from src._internal.load_config import load_manifest, read_toml_config
+
+CONFIG = Path(__file__).resolve().parent.parent / "app-config.toml"
+
+
+def write_manifest(path, entries):
+    path.write_text("".join(f"[[sites]]\n{entry}\n" for entry in entries))
+    return path
+
+
+def site_entry(name, overrides=None):
+    entry = f"name = '{name}'\ninput_path = 'in/{name}'\noutput_path = 'out/{name}'\n"
+    if overrides is not None:
+        entry += f"overrides = {overrides!r}\n"
+    return entry
+
+
+def test_load_manifest(tmp_path):
+    manifest = write_manifest(tmp_path / "manifest.toml", [
+        site_entry("S1"),
+        site_entry("S2", overrides=["standard_temperature=15"]),
+    ])
+    sites = load_manifest(str(manifest))
+    assert [site.name for site in sites] == ["S1", "S2"]
+    assert sites[0].overrides == []
+    assert sites[1].overrides == ["standard_temperature=15"]
+    assert sites[1].input_path == "in/S2"
+
+
+def test_load_manifest_missing_key(tmp_path):
+    manifest = write_manifest(tmp_path / "manifest.toml", ["name = 'S1'\ninput_path = 'in/S1'\n"])
+    with pytest.raises(ValueError, match="output_path"):
+        load_manifest(str(manifest))
+
+
+def test_load_manifest_duplicate_names(tmp_path):
+    manifest = write_manifest(tmp_path / "manifest.toml", [site_entry("S1"), site_entry("S1")])
+    with pytest.raises(ValueError, match="Duplicate site names"):
+        load_manifest(str(manifest))
+
+
+def test_failed_site_is_returned_not_raised(tmp_path):
+    config_data = read_toml_config(CONFIG)
+    config_data["execution_path"] = str(tmp_path / "executions")
+    site = SiteSpec(name="S1", input_path=str(tmp_path / "missing"), output_path=str(tmp_path / "out"))
+
+    result = execute_site(site, config_data)
+
+    assert not result.succeeded
+    assert result.name == "S1"
+    assert "pre_result.csv" in result.error
+    # the execution directory was created before the failure
+    assert result.execution_id is not None
+    assert not (tmp_path / "out").exists()
+
+
+@pytest.fixture
+def summary_records():
+    # the project loggers don't propagate, so listen on the module logger itself
+    handler = logging.handlers.BufferingHandler(capacity=100)
+    batch_executor.logger.addHandler(handler)
+    yield handler.buffer
+    batch_executor.logger.removeHandler(handler)
+
+
+def test_fleet_summary(summary_records):
+    results = [
+        SiteResult(name="S2", succeeded=False, duration_seconds=1.0, error="ValueError: bad"),
+        SiteResult(name="S1", succeeded=True, duration_seconds=2.0, execution_id="execution-1"),
+        SiteResult(name="S0", succeeded=False, duration_seconds=0.0, error="BrokenProcessPool: killed"),
+    ]
+    log_fleet_summary(results, 30.0)
+
+    assert summary_records[0].getMessage() == "Batch finished: 1/3 sites succeeded in 30.0s (6.0 sites/minute)."
+    # failures are listed by site name
+    errors = [record.getMessage() for record in summary_records if record.levelno == logging.ERROR]
+    assert errors == ["[S0] BrokenProcessPool: killed", "[S2] ValueError: bad"]
+
+
+def test_fleet_summary_of_an_empty_batch(summary_records):
+    log_fleet_summary([], 0.0)
+    assert [record.getMessage() for record in summary_records] == [
+        "Batch finished: 0/0 sites succeeded in 0.0s (0.0 sites/minute)."]
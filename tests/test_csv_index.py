@@ -0,0 +1,153 @@
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src._internal.utilities import csv_index
+from src._internal.utilities.csv_index import index_path_for, load_index, read_selection, tank_keys
+
+HEADER = "companyID,siteID,TankID,ATGRecordDateTime,WaterLevelCurrent\n"
+
+
+def write_csv(path, lines):
+    path.write_text(HEADER + "".join(f"{line}\n" for line in lines))
+    return path
+
+
+def full_parse(path, tanks=None, start=None, end=None):
+    """
+    Reference: parse everything, then filter.
+    """
+    df = pd.read_csv(path)
+    mask = pd.Series(True, index=df.index)
+    if tanks is not None:
+        mask &= tank_keys(df).isin(tanks)
+    ts = pd.to_datetime(df["ATGRecordDateTime"], format="ISO8601", utc=True)
+    if start is not None:
+        mask &= ts >= pd.Timestamp(start, tz="UTC")
+    if end is not None:
+        mask &= ts < pd.Timestamp(end, tz="UTC")
+    return df[mask].reset_index(drop=True)
+
+
+@pytest.fixture
+def readings(tmp_path):
+    lines = []
+    for hour in range(6):
+        for tank in (1, 2, 3):
+            for minute in (0, 20, 40):
+                lines.append(f"1,88,{tank},2025-01-01T{hour:02d}:{minute:02d}:00,{hour + minute / 100}")
+    return write_csv(tmp_path / "readings.csv", lines)
+
+
+@pytest.mark.parametrize("tanks, start, end", [
+    (None, None, None),
+    (["1-88-2"], None, None),
+    (["1-88-1", "1-88-3"], "2025-01-01T01:20:00", "2025-01-01T04:00:00"),
+    (None, "2025-01-01T02:00:00", None),
+    (["1-88-2"], None, "2025-01-01T00:40:00"),
+    (["9-9-9"], None, None),
+])
+def test_selection_matches_full_parse(readings, tanks, start, end):
+    selected = read_selection(readings, tanks, start, end)
+    pd.testing.assert_frame_equal(selected, full_parse(readings, tanks, start, end), check_dtype=False)
+
+
+def test_edit_in_the_middle_invalidates_index(readings):
+    assert len(read_selection(readings, ["1-88-2"], "2025-01-01T02:00:00", "2025-01-01T03:00:00")) == 3
+
+    # same size, only a row in the middle changes tank
+    text = readings.read_text()
+    edited = text.replace("1,88,2,2025-01-01T02:20:00", "1,88,7,2025-01-01T02:20:00")
+    assert len(edited) == len(text)
+    stat = readings.stat()
+    readings.write_text(edited)
+    os.utime(readings, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert len(read_selection(readings, ["1-88-7"])) == 1
+    assert len(read_selection(readings, ["1-88-2"], "2025-01-01T02:00:00", "2025-01-01T03:00:00")) == 2
+
+
+def test_index_is_reused_while_unchanged(readings):
+    load_index(readings)
+    stored = index_path_for(readings).stat().st_mtime_ns
+    load_index(readings)
+    assert index_path_for(readings).stat().st_mtime_ns == stored
+
+
+def test_header_only_file(tmp_path):
+    source = write_csv(tmp_path / "empty.csv", [])
+    assert len(load_index(source)["key"]) == 0
+    selected = read_selection(source, ["1-88-1"], "2025-01-01", "2025-01-02")
+    assert selected.empty
+    assert list(selected.columns) == HEADER.strip().split(",")
+
+
+def test_keys_match_the_pipeline_key(tmp_path):
+    # leading zeros are dropped by the int parse the pipeline's keys come from
+    source = write_csv(tmp_path / "zeros.csv", [
+        "1,88,01,2025-01-01T00:00:00,1.0",
+        "1,88,02,2025-01-01T00:00:00,2.0",
+    ])
+    selected = read_selection(source, ["1-88-1"])
+    pd.testing.assert_frame_equal(selected, full_parse(source, ["1-88-1"]))
+    assert selected["WaterLevelCurrent"].tolist() == [1.0]
+
+
+def test_blank_lines_are_skipped(tmp_path):
+    source = tmp_path / "blank.csv"
+    source.write_text(HEADER + "1,88,1,2025-01-01T00:00:00,1.0\n\n  \n1,88,2,2025-01-01T01:00:00,2.0\n")
+    pd.testing.assert_frame_equal(read_selection(source, ["1-88-2"]), full_parse(source, ["1-88-2"]))
+
+
+def test_tz_aware_file_with_naive_bounds(tmp_path):
+    source = write_csv(tmp_path / "aware.csv", [
+        "1,88,1,2025-01-01T09:30:00+02:00,1.0",     # 07:30 UTC
+        "1,88,1,2025-01-01T08:30:00+00:00,2.0",
+        "1,88,1,2025-01-01T10:30:00+01:00,3.0",     # 09:30 UTC
+    ])
+    selected = read_selection(source, ["1-88-1"], "2025-01-01T08:00:00", "2025-01-01T10:00:00")
+    assert selected["WaterLevelCurrent"].tolist() == [2.0, 3.0]
+    pd.testing.assert_frame_equal(
+        selected, full_parse(source, ["1-88-1"], "2025-01-01T08:00:00", "2025-01-01T10:00:00"))
+
+
+@pytest.mark.parametrize("window, chunk_rows", [(7, 2), (64, 5), (1 << 20, 1000)])
+def test_windowed_build_matches_full_parse(readings, monkeypatch, window, chunk_rows):
+    monkeypatch.setattr(csv_index, "SCAN_WINDOW_BYTES", window)
+    monkeypatch.setattr(csv_index, "INDEX_CHUNK_ROWS", chunk_rows)
+    # blank lines and a missing trailing newline, across window edges
+    text = readings.read_text().replace("\n1,88,2,2025-01-01T03:20", "\n\n   \n1,88,2,2025-01-01T03:20")
+    readings.write_text(text.rstrip("\n"))
+
+    selected = read_selection(readings, ["1-88-2", "1-88-3"], "2025-01-01T01:20:00", "2025-01-01T05:10:00")
+    pd.testing.assert_frame_equal(
+        selected, full_parse(readings, ["1-88-2", "1-88-3"], "2025-01-01T01:20:00", "2025-01-01T05:10:00"),
+        check_dtype=False)
+    assert len(read_selection(readings)) == 54
+
+
+def test_scan_lines_matches_python(tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_index, "SCAN_WINDOW_BYTES", 5)
+    for text in [b"a\n\n  \nb", b"ab\n", b"\n \n", b" x \r\n\r\n", b"abcdefghijk\nl"]:
+        source = tmp_path / "lines.csv"
+        source.write_bytes(text)
+        lines = text.splitlines(keepends=True)
+        expected_ends = np.cumsum([len(line) for line in lines])
+        expected_content = [bool(line.strip()) for line in lines]
+        with source.open('rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ends, content = csv_index._scan_lines(mm)
+        assert ends.tolist() == expected_ends.tolist(), text
+        assert content.tolist() == expected_content, text
+
+
+def test_concurrent_writers_leave_one_valid_sidecar(readings):
+    index = csv_index.build_index(readings)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: csv_index._write_index(index_path_for(readings), index), range(32)))
+
+    assert [p.name for p in readings.parent.iterdir() if p.name.endswith(".tmp")] == []
+    assert len(load_index(readings)["key"]) == len(index["key"])
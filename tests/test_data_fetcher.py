@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from data_fetcher import DataFetcher
+from data_processor import DataProcessor
+from src._internal.dataset_registry import DatasetRegistry
+
+def test_tank_batches_keep_tanks_whole():
+    atg_df = pd.DataFrame({
+        "companyID": 1,
+        "siteID": 88,
+        "TankID": [1, 2, 3, 1, 2, 3, 4, 4, 4, 1],
+        "ATGRecordID": range(10),
+    })
+    batches = list(DataProcessor.tank_batches(atg_df, batch_rows=3))
+    assert len(batches) > 1
+    assert sum(len(batch) for batch in batches) == len(atg_df)
+    seen = [set(batch["TankID"]) for batch in batches]
+    assert all(not (a & b) for i, a in enumerate(seen) for b in seen[i + 1:])
+    # file order is kept within a tank
+    for batch in batches:
+        for _, tank in batch.groupby("TankID"):
+            assert tank["ATGRecordID"].is_monotonic_increasing
+
+
+def test_results_come_from_the_registry(tmp_path):
+    now = datetime(2025, 1, 1, 10, 25)
+    pre_df = pd.DataFrame({"TankID": [1, 2], "CloseWaterLevelCurrent": [0.5, 0.7]})
+    atg_df = pd.DataFrame({"TankID": [1, 1, 2], "WaterLevelCurrent": [0.5, 0.6, 0.7]})
+    # room for pre_result only, atg_result is spilled and read back from disk
+    datasets = DatasetRegistry(spill_path=tmp_path / "datasets",
+                               memory_budget_bytes=int(pre_df.memory_usage(deep=True).sum()))
+    datasets.publish("atg_result", atg_df)
+    datasets.publish("pre_result", pre_df)
+    assert (tmp_path / "datasets" / "atg_result.pkl").exists()
+
+    # no CSVs in the input path, everything comes from the registry
+    input_path = tmp_path / "input"
+    assert DataFetcher.get_pre_result(now, input_path, datasets)["pre_obs_result"] is pre_df
+    atg_result = DataFetcher.get_atg_result(now, input_path, datasets)
+    pd.testing.assert_frame_equal(atg_result["atg_result"], atg_df)
+    assert atg_result["last_hour_start"] == "2025-01-01T10:00:00"
+
+    # without the dataset the CSV is required
+    with pytest.raises(FileNotFoundError, match="atg_result.csv"):
+        DataFetcher.get_atg_result(now, input_path, DatasetRegistry(tmp_path / "empty", 10 ** 9))
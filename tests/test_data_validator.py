@@ -0,0 +1,134 @@
+import pandas as pd
+import pytest
+
+from data_validator import ATG_COLUMNS, PRE_COLUMNS, REPORT_COLUMNS, DataValidator
+
+
+def atg_rows(*readings, tank=3):
+    return pd.DataFrame([
+        dict(companyID=1, siteID=88, TankID=tank, GradeID=1, ATGRecordID=i, ATGRecordDateTime=ts,
+             WaterLevelCurrent=water, ProductLevelCurrent=product, ProductVolumeCurrent=100.0,
+             ProductTemperatureCurrent=15.0)
+        for i, (ts, water, product) in enumerate(readings)
+    ])
+
+
+def pre_rows(*closes):
+    return pd.DataFrame([
+        dict(PK=pk, CloseATGRecordID=0, CloseATGRecordDateTime=ts, CloseWaterLevelCurrent=1.0,
+             CloseProductLevelCurrent=50.0, CloseProductVolumeCurrent=100.0, CloseProductTemperatureCurrent=15.0)
+        for pk, ts in closes
+    ])
+
+
+def test_clean_batch_passes_strict():
+    atg = atg_rows(("2025-01-01 10:00:00", 1, 50), ("2025-01-01 10:10:00", 1, 49))
+    pre_df, atg_df, report = DataValidator.validate_frames(pre_rows(("1-88-3", "2025-01-01 09:55:00")), atg, {})
+
+    assert len(atg_df) == 2 and len(pre_df) == 1
+    assert report.loc[0, "rows"] == 2 and report.loc[0, "quarantined"] == 0
+    assert list(atg_df["ATGRecordDateTime"]) == ["2025-01-01T10:00:00+00:00", "2025-01-01T10:10:00+00:00"]
+
+
+def test_each_issue_is_flagged_and_quarantined():
+    atg = atg_rows(
+        ("2025-01-01 10:00:00", 1, 50),
+        ("2025-01-01 09:50:00", 1, 50),     # before the previous close -> out of order
+        ("not a time", 1, 50),
+        ("2025-01-01 10:10:00", -1, 50),    # negative level
+        ("2025-01-01 10:20:00", 60, 50),    # water above product
+        ("2025-01-01 11:20:00", 1, 50),     # 60 minute gap
+    )
+    atg = pd.concat([atg, atg.iloc[[0]]], ignore_index=True)   # duplicate record
+    config = {"validation_mode": "quarantine", "expected_interval_minutes": 15}
+
+    _, atg_df, report = DataValidator.validate_frames(pre_rows(("1-88-3", "2025-01-01 09:55:00")), atg, config)
+
+    row = report.iloc[0]
+    assert row["duplicate_record"] == 1
+    assert row["unparseable_timestamp"] == 1
+    assert row["out_of_order_timestamp"] == 2   # 09:50 and the duplicate of 10:00 after 11:20
+    assert row["invalid_level"] == 1
+    assert row["water_above_product"] == 1
+    assert row["gaps"] == 1 and row["max_gap_minutes"] == 60
+    assert list(atg_df["ATGRecordID"]) == [0, 5]
+    assert row["valid_rows"] == 2
+
+
+def test_out_of_order_after_unparseable_timestamp():
+    atg = atg_rows(
+        ("2025-01-01 10:00:00", 1, 50),
+        ("garbage", 1, 50),
+        ("2025-01-01 09:50:00", 1, 50),
+    )
+    _, atg_df, report = DataValidator.validate_frames(pd.DataFrame(), atg, {"validation_mode": "quarantine"})
+
+    assert report.loc[0, "unparseable_timestamp"] == 1
+    assert report.loc[0, "out_of_order_timestamp"] == 1
+    assert list(atg_df["ATGRecordID"]) == [0]
+
+
+def test_strict_raises_after_writing_report(tmp_path):
+    atg = atg_rows(("2025-01-01 10:00:00", -1, 50))
+    report_path = tmp_path / "report.csv"
+
+    with pytest.raises(ValueError, match="invalid_level"):
+        DataValidator.validate_frames(pre_rows(), atg, {}, report_path=report_path)
+
+    report = pd.read_csv(report_path)
+    assert report.loc[0, "invalid_level"] == 1
+
+
+def test_duplicate_pre_pk_fails_strict_and_is_dropped_in_quarantine():
+    pre = pre_rows(("1-88-3", "2025-01-01 09:55:00"), ("1-88-3", "2025-01-01 09:56:00"))
+    atg = atg_rows(("2025-01-01 10:00:00", 1, 50))
+
+    with pytest.raises(ValueError, match="pre_duplicate_record"):
+        DataValidator.validate_frames(pre, atg, {})
+
+    pre_df, atg_df, report = DataValidator.validate_frames(pre, atg, {"validation_mode": "quarantine"})
+    assert pre_df.empty and len(atg_df) == 1
+    assert report.loc[0, "pre_duplicate_record"] == 2
+
+
+def test_empty_inputs_are_valid():
+    pre_df, atg_df, report = DataValidator.validate_frames(pd.DataFrame(), pd.DataFrame(), {})
+    assert pre_df.empty and atg_df.empty and report.empty
+    assert list(report.columns) == REPORT_COLUMNS
+
+    # header-only CSVs, as DataFetcher returns them
+    pre_data, atg_data, _ = DataValidator.validate(
+        {"pre_obs_result": pd.DataFrame(columns=PRE_COLUMNS)},
+        {"atg_result": pd.DataFrame(columns=ATG_COLUMNS), "last_hour_start": "x"}, {})
+    assert pre_data["pre_obs_result"].empty and atg_data["atg_result"].empty
+
+
+def test_empty_pre_result_with_readings():
+    _, atg_df, report = DataValidator.validate_frames(pd.DataFrame(), atg_rows(("2025-01-01 10:00:00", 1, 50)), {})
+    assert len(atg_df) == 1 and report.loc[0, "rows"] == 1
+
+
+def test_mixed_iso_formats_and_offsets():
+    atg = atg_rows(
+        ("2025-01-01 10:00:00", 1, 50),
+        ("2025-01-01 10:50:00.500", 1, 50),
+        ("2025-01-01T12:55:00+02:00", 1, 50),     # 10:55 UTC
+    )
+    pre = pre_rows(("1-88-3", "2025-01-01T09:55:00Z"))
+
+    _, atg_df, report = DataValidator.validate_frames(pre, atg, {})
+
+    assert report.loc[0, "quarantined"] == 0
+    # one sub-second value puts the whole batch at microsecond precision
+    assert list(atg_df["ATGRecordDateTime"]) == [
+        "2025-01-01T10:00:00.000000+00:00",
+        "2025-01-01T10:50:00.500000+00:00",
+        "2025-01-01T10:55:00.000000+00:00",
+    ]
+    # string order matches time order for build_obs_result
+    assert sorted(atg_df["ATGRecordDateTime"]) == list(atg_df["ATGRecordDateTime"])
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="validation_mode"):
+        DataValidator.validate_frames(pre_rows(), atg_rows(), {"validation_mode": "lenient"})
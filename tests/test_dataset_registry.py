@@ -0,0 +1,98 @@
+import pandas as pd
+import pytest
+
+from src._internal.dataset_registry import DatasetRegistry
+
+
+def table(rows, value=1.0):
+    return pd.DataFrame({"TankID": range(rows), "level": value})
+
+
+def size_of(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return DatasetRegistry(spill_path=tmp_path / "datasets", memory_budget_bytes=10 ** 9)
+
+
+def test_publish_and_get(registry):
+    df = table(5)
+    registry.publish("atg_result", df)
+    assert registry.has("atg_result")
+    assert registry.get("atg_result") is df
+    assert registry.names() == ["atg_result"]
+    assert registry.memory_usage() == size_of(df)
+    # nothing is written while the budget holds
+    assert not registry.spill_path.exists()
+
+    with pytest.raises(KeyError):
+        registry.get("pre_result")
+    assert not registry.has("pre_result")
+
+
+def test_publish_replaces(registry):
+    registry.publish("atg_result", table(5))
+    registry.publish("atg_result", table(3, value=2.0))
+    assert registry.get("atg_result")["level"].tolist() == [2.0] * 3
+    assert registry.memory_usage() == size_of(table(3))
+
+
+def test_least_recently_used_table_is_spilled(tmp_path):
+    first, second, third = table(100, 1.0), table(100, 2.0), table(100, 3.0)
+    registry = DatasetRegistry(spill_path=tmp_path / "datasets", memory_budget_bytes=2 * size_of(first))
+    registry.publish("first", first)
+    registry.publish("second", second)
+    # touching 'first' makes 'second' the least recently used
+    registry.get("first")
+    registry.publish("third", third)
+
+    assert (tmp_path / "datasets" / "second.pkl").exists()
+    assert not (tmp_path / "datasets" / "first.pkl").exists()
+    assert registry.memory_usage() == 2 * size_of(first)
+    assert registry.names() == ["first", "second", "third"]
+
+    # spilled tables read back from disk, as copies
+    spilled = registry.get("second")
+    assert spilled is not second
+    pd.testing.assert_frame_equal(spilled, second)
+    assert registry.get("first") is first
+
+
+def test_table_over_the_whole_budget_is_spilled(tmp_path):
+    registry = DatasetRegistry(spill_path=tmp_path / "datasets", memory_budget_bytes=1)
+    registry.publish("atg_result", table(10))
+    assert registry.memory_usage() == 0
+    pd.testing.assert_frame_equal(registry.get("atg_result"), table(10))
+
+
+def test_persist_writes_and_keeps_in_memory(registry):
+    df = table(5)
+    registry.publish("atg_result", df, persist=True)
+    assert (registry.spill_path / "atg_result.pkl").exists()
+    pd.testing.assert_frame_equal(pd.read_pickle(registry.spill_path / "atg_result.pkl"), df)
+    assert registry.get("atg_result") is df
+    assert registry.memory_usage() == size_of(df)
+
+
+def test_discard_removes_the_spill_file(tmp_path):
+    registry = DatasetRegistry(spill_path=tmp_path / "datasets", memory_budget_bytes=1)
+    registry.publish("atg_result", table(10))
+    spill_file = tmp_path / "datasets" / "atg_result.pkl"
+    assert spill_file.exists()
+
+    registry.discard("atg_result")
+    assert not spill_file.exists()
+    assert not registry.has("atg_result")
+    assert registry.names() == []
+    # discarding an unknown name is a no-op
+    registry.discard("atg_result")
+
+
+def test_republish_drops_a_stale_spill_file(tmp_path):
+    registry = DatasetRegistry(spill_path=tmp_path / "datasets", memory_budget_bytes=10 ** 9)
+    registry.publish("atg_result", table(5), persist=True)
+    registry.publish("atg_result", table(3, value=2.0))
+    assert not (tmp_path / "datasets" / "atg_result.pkl").exists()
+    assert registry.get("atg_result")["level"].tolist() == [2.0] * 3
@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from src._internal.observation_store import ObservationStore, normalize_hour
+
+TABLE = "water_ingress_observations"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ObservationStore(tmp_path / "observations.db")
+    yield store
+    store.close()
+
+
+def observations(hours, tank=3, level=1.0):
+    return pd.DataFrame({
+        "companyID": 1,
+        "siteID": 88,
+        "TankID": tank,
+        "ATGRecordDateHour": hours,
+        "CloseWaterLevelCurrent": level,
+    })
+
+
+def test_empty_frames_are_a_no_op(store):
+    assert store.upsert(TABLE, pd.DataFrame([])) == 0
+    assert store.upsert(TABLE, observations([])) == 0
+
+
+def test_missing_key_columns_are_rejected(store):
+    with pytest.raises(ValueError, match="missing key columns"):
+        store.upsert(TABLE, pd.DataFrame({"companyID": [1]}))
+
+
+def test_key_only_frames(store):
+    keys = observations(["2025-01-01T10:00:00", "2025-01-01T11:00:00"]).drop(columns="CloseWaterLevelCurrent")
+    assert store.upsert(TABLE, keys) == 2
+    # the same keys again are kept once
+    assert store.upsert(TABLE, keys) == 2
+    assert store.query_range(TABLE, "1-88-3")["ATGRecordDateHour"].tolist() == [
+        "2025-01-01T10:00:00+00:00", "2025-01-01T11:00:00+00:00"]
+    assert store.latest(TABLE)["ATGRecordDateHour"].tolist() == ["2025-01-01T11:00:00+00:00"]
+
+
+def test_naive_and_aware_hours_share_one_format(store):
+    naive = pd.to_datetime(["2025-01-01 10:00", "2025-01-01 11:00"])
+    store.upsert(TABLE, observations(naive))
+    # the same hours again, as offset strings, replace rather than duplicate
+    store.upsert(TABLE, observations(["2025-01-01T12:00:00+02:00", "2025-01-01T12:00:00+01:00"], level=2.0))
+
+    stored = store.query_range(TABLE, "1-88-3")
+    assert stored["ATGRecordDateHour"].tolist() == ["2025-01-01T10:00:00+00:00", "2025-01-01T11:00:00+00:00"]
+    assert stored["CloseWaterLevelCurrent"].tolist() == [2.0, 2.0]
+
+
+def test_range_bounds(store):
+    hours = pd.date_range("2025-01-01 00:00", periods=6, freq="h")
+    store.upsert(TABLE, observations(hours))
+
+    selected = store.query_range(TABLE, "1-88-3", start="2025-01-01 01:00", end="2025-01-01 04:00")
+    assert selected["ATGRecordDateHour"].str[11:13].tolist() == ["01", "02", "03"]
+
+    # bounds of any form name the same instants
+    aware = store.query_range(TABLE, "1-88-3", start=datetime(2025, 1, 1, 3, tzinfo=timezone.utc),
+                              end="2025-01-01T06:00:00+02:00")
+    assert aware["ATGRecordDateHour"].str[11:13].tolist() == ["03"]
+
+
+def test_latest_per_tank(store):
+    store.upsert(TABLE, pd.concat([
+        observations(["2025-01-01T10:00:00", "2025-01-01T11:00:00"], tank=1, level=1.0),
+        observations(["2025-01-01T09:00:00"], tank=2, level=5.0),
+    ]))
+    # an older hour arriving late doesn't replace the newest row
+    store.upsert(TABLE, observations(["2025-01-01T08:00:00"], tank=1, level=9.0))
+
+    latest = store.latest(TABLE).sort_values("TankID")
+    assert latest["ATGRecordDateHour"].tolist() == ["2025-01-01T11:00:00+00:00", "2025-01-01T09:00:00+00:00"]
+    assert store.latest(TABLE, tanks=["1-88-2"])["CloseWaterLevelCurrent"].tolist() == [5.0]
+
+
+def test_normalize_hour():
+    assert normalize_hour("2025-01-01 10:00") == "2025-01-01T10:00:00+00:00"
+    assert normalize_hour("2025-01-01T12:00:00+02:00") == "2025-01-01T10:00:00+00:00"
+    with pytest.raises(ValueError):
+        normalize_hour("not a time")
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src._internal.utilities.resampling import GridResampler, _parse_times, resample
+
+INTERVAL = 15
+
+
+def make_readings(seed=0, tanks=3, per_tank=40):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for tank in range(1, tanks + 1):
+        # irregular steps, a few of them long enough to be gaps
+        steps = rng.choice([1, 4, 7, 11, 50], size=per_tank, p=[.2, .3, .3, .15, .05])
+        times = pd.Timestamp("2025-01-01T00:03:00") + pd.to_timedelta(np.cumsum(steps), unit="min")
+        frames.append(pd.DataFrame({
+            "companyID": 1, "siteID": 88, "TankID": tank,
+            "ATGRecordDateTime": times.strftime("%Y-%m-%dT%H:%M:%S"),
+            "level": rng.uniform(0, 100, per_tank).round(2),
+        }))
+    # interleave the tanks the way raw exports do
+    return pd.concat(frames).sort_values("ATGRecordDateTime", kind="stable").reset_index(drop=True)
+
+
+def reference(readings, method, max_gap_minutes):
+    """
+    One tank and one grid point at a time.
+    """
+    rows = []
+    max_gap = pd.Timedelta(minutes=max_gap_minutes) if max_gap_minutes is not None else None
+    for (company, site, tank), group in readings.groupby(["companyID", "siteID", "TankID"]):
+        times = pd.to_datetime(group["ATGRecordDateTime"]).tolist()
+        values = group["level"].tolist()
+        point = pd.Timestamp(min(times)).ceil(f"{INTERVAL}min")
+        while point <= max(times):
+            before = [i for i, t in enumerate(times) if t <= point]
+            after = [i for i, t in enumerate(times) if t >= point]
+            prev = max(before, key=lambda i: times[i])
+            value = np.nan
+            if method == "last":
+                if max_gap is None or point - times[prev] <= max_gap:
+                    value = values[prev]
+            elif times[prev] == point:
+                value = values[prev]
+            elif after:
+                nxt = min(after, key=lambda i: times[i])
+                if max_gap is None or times[nxt] - times[prev] <= max_gap:
+                    weight = (point - times[prev]) / (times[nxt] - times[prev])
+                    value = values[prev] + weight * (values[nxt] - values[prev])
+            rows.append((company, site, tank, point, value))
+            point += pd.Timedelta(minutes=INTERVAL)
+    return pd.DataFrame(rows, columns=["companyID", "siteID", "TankID", "ATGRecordDateTime", "level"])
+
+
+@pytest.mark.parametrize("method", ["last", "linear"])
+@pytest.mark.parametrize("max_gap_minutes", [None, 20])
+def test_matches_per_tank_reference(method, max_gap_minutes):
+    readings = make_readings()
+    result = resample(readings, ["level"], INTERVAL, method, max_gap_minutes)
+    # tanks come out in order of appearance
+    result = result.sort_values(["TankID", "ATGRecordDateTime"], ignore_index=True)
+    expected = reference(readings, method, max_gap_minutes)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("method", ["last", "linear"])
+@pytest.mark.parametrize("offset", [None, "+02:00"])
+def test_incremental_matches_one_shot(method, offset):
+    readings = make_readings(seed=1)
+    if offset:
+        readings["ATGRecordDateTime"] += offset
+    one_shot = resample(readings, ["level"], INTERVAL, method, max_gap_minutes=20)
+
+    resampler = GridResampler(["level"], INTERVAL, method, max_gap_minutes=20)
+    batches = np.array_split(np.arange(len(readings)), 7)
+    incremental = pd.concat([resampler.extend(readings.iloc[rows]) for rows in batches], ignore_index=True)
+
+    # the last point of a tank is only final once a later reading arrives
+    key = ["companyID", "siteID", "TankID", "ATGRecordDateTime"]
+    merged = one_shot.merge(incremental, on=key, how="inner", suffixes=("", "_incremental"))
+    assert len(merged) == len(incremental)
+    assert len(one_shot) - len(incremental) <= 3
+    np.testing.assert_allclose(merged["level_incremental"], merged["level"])
+
+
+def test_timezone_is_kept():
+    readings = pd.DataFrame({
+        "companyID": 1, "siteID": 88, "TankID": 3,
+        "ATGRecordDateTime": ["2025-01-01T10:05:00+02:00", "2025-01-01T10:40:00+02:00"],
+        "level": [1.0, 2.0],
+    })
+    result = resample(readings, ["level"], 30)
+    assert result["ATGRecordDateTime"].tolist() == [pd.Timestamp("2025-01-01T10:30:00+02:00")]
+    assert str(result["ATGRecordDateTime"].dt.tz) == "UTC+02:00"
+
+    # naive bounds are read in the readings' timezone
+    bounded = resample(readings, ["level"], 30, start="2025-01-01T10:00:00", end="2025-01-01T11:00:00")
+    assert bounded["ATGRecordDateTime"].dt.strftime("%H:%M%z").tolist() == ["10:00+0200", "10:30+0200", "11:00+0200"]
+
+
+def test_mixed_offsets_come_back_in_utc():
+    readings = pd.DataFrame({
+        "companyID": 1, "siteID": 88, "TankID": 3,
+        "ATGRecordDateTime": ["2025-01-01T10:05:00+02:00", "2025-01-01T09:40:00+01:00"],
+        "level": [1.0, 2.0],
+    })
+    result = resample(readings, ["level"], 30)
+    assert result["ATGRecordDateTime"].tolist() == [pd.Timestamp("2025-01-01T08:30:00+00:00")]
+    assert result["level"].tolist() == [1.0]
+
+
+def test_naive_readings_stay_naive():
+    readings = make_readings(tanks=1, per_tank=5)
+    assert resample(readings, ["level"], INTERVAL)["ATGRecordDateTime"].dt.tz is None
+
+
+@pytest.mark.filterwarnings("error")
+@pytest.mark.parametrize("values, tz", [
+    (["2025-01-01T10:05:00", "2025-01-01 10:40:00", "junk"], None),
+    (["2025-01-01T10:05:00-05:00", "2025-01-01T10:40:00-0500", "junk"], "UTC-05:00"),
+    (["2025-01-01T10:05:00Z", "2025-01-01T10:40:00+00:00"], "UTC"),
+    (["2025-01-01T10:05:00+02:00", "2025-01-01T09:40:00+01:00"], "UTC"),
+    (["2025-01-01T10:05:00+02:00", "2025-01-01T09:40:00"], "UTC"),
+    (["junk", None], None),
+])
+def test_parse_times(values, tz):
+    parsed = _parse_times(pd.Series(values))
+    assert str(parsed.dt.tz) == str(tz)
+    # the same instants as a plain UTC parse, naive values read as UTC
+    in_utc = parsed.dt.tz_localize("UTC") if tz is None else parsed.dt.tz_convert("UTC")
+    pd.testing.assert_series_equal(
+        in_utc, pd.to_datetime(pd.Series(values), errors="coerce", format="ISO8601", utc=True))
@@ -0,0 +1,147 @@
+import logging
+import logging.handlers
+import time
+
+import pytest
+
+from src._internal import resource_governor
+from src._internal.resource_governor import (
+    UNLIMITED, ResourceBudget, RssMonitor, cgroup_cpu_limit, cgroup_dirs, cgroup_memory_limit,
+)
+
+MiB = 1024 * 1024
+
+
+@pytest.fixture
+def cgroup(tmp_path, monkeypatch):
+    """
+    An empty cgroup mount and /proc/self/cgroup, fill them with `write`.
+    """
+    root = tmp_path / "cgroup"
+    root.mkdir()
+    proc = tmp_path / "proc_self_cgroup"
+    monkeypatch.setattr(resource_governor, "CGROUP_ROOT", root)
+    monkeypatch.setattr(resource_governor, "PROC_SELF_CGROUP", proc)
+
+    def write(relative, text):
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text + "\n")
+
+    return write
+
+
+def test_no_cgroup_files(cgroup):
+    assert cgroup_memory_limit() is None
+    assert cgroup_cpu_limit() is None
+
+
+def test_v2_limits_of_the_process_cgroup(cgroup):
+    cgroup("proc_self_cgroup", "0::/kubepods/pod1/app")
+    cgroup("cgroup/memory.max", "max")
+    cgroup("cgroup/cpu.max", "max 100000")
+    cgroup("cgroup/kubepods/pod1/memory.max", str(4096 * MiB))
+    cgroup("cgroup/kubepods/pod1/app/memory.max", str(2048 * MiB))
+    cgroup("cgroup/kubepods/pod1/cpu.max", "150000 100000")
+    cgroup("cgroup/kubepods/pod1/app/cpu.max", "max 100000")
+
+    assert [path.name for path in cgroup_dirs()] == ["app", "pod1", "kubepods", "cgroup"]
+    assert cgroup_memory_limit() == 2048 * MiB
+    # the pod's quota applies to the container below it
+    assert cgroup_cpu_limit() == 1.5
+
+
+def test_v1_limits_of_the_process_cgroup(cgroup):
+    cgroup("proc_self_cgroup", "5:cpu,cpuacct:/docker/abc\n4:memory:/docker/abc\n1:name=systemd:/init.scope")
+    cgroup("cgroup/memory/memory.limit_in_bytes", str(UNLIMITED + 4096))
+    cgroup("cgroup/memory/docker/abc/memory.limit_in_bytes", str(512 * MiB))
+    cgroup("cgroup/cpu,cpuacct/docker/abc/cpu.cfs_quota_us", "250000")
+    cgroup("cgroup/cpu,cpuacct/docker/abc/cpu.cfs_period_us", "100000")
+    cgroup("cgroup/cpu,cpuacct/docker/cpu.cfs_quota_us", "-1")
+    cgroup("cgroup/cpu,cpuacct/docker/cpu.cfs_period_us", "100000")
+
+    assert cgroup_memory_limit() == 512 * MiB
+    assert cgroup_cpu_limit() == 2.5
+
+
+def test_unlimited_v1_values(cgroup):
+    cgroup("proc_self_cgroup", "4:memory:/\n3:cpu:/")
+    cgroup("cgroup/memory/memory.limit_in_bytes", "9223372036854771712")
+    cgroup("cgroup/cpu/cpu.cfs_quota_us", "-1")
+    cgroup("cgroup/cpu/cpu.cfs_period_us", "100000")
+    assert cgroup_memory_limit() is None
+    assert cgroup_cpu_limit() is None
+
+
+def test_mount_point_without_proc_entry(cgroup):
+    # a namespaced container sees its own cgroup at the mount point
+    cgroup("cgroup/memory.max", str(1024 * MiB))
+    cgroup("cgroup/cpu.max", "50000")
+    assert cgroup_dirs() == [resource_governor.CGROUP_ROOT]
+    assert cgroup_memory_limit() == 1024 * MiB
+    assert cgroup_cpu_limit() == 0.5
+
+
+def test_detect_uses_the_cgroup_limits(cgroup):
+    cgroup("proc_self_cgroup", "0::/app")
+    cgroup("cgroup/app/memory.max", str(1000 * MiB))
+    cgroup("cgroup/app/cpu.max", "100000 100000")
+    budget = ResourceBudget.detect(memory_fraction=0.5)
+    assert budget.memory_limit_bytes == min(1000 * MiB, resource_governor.physical_memory())
+    assert budget.memory_budget_bytes == budget.memory_limit_bytes // 2
+    assert budget.cpu_limit == 1
+
+
+@pytest.mark.parametrize("cpu_limit, bytes_per_worker, expected", [
+    (4, 100, 4),     # CPU bound
+    (4, 300, 3),     # memory bound
+    (2.5, 10, 2),    # partial CPUs round down
+    (0.5, 10, 1),    # at least one worker
+    (4, 2000, 1),
+])
+def test_worker_count(cpu_limit, bytes_per_worker, expected):
+    budget = ResourceBudget(memory_limit_bytes=2000, cpu_limit=cpu_limit, memory_budget_bytes=1000)
+    assert budget.worker_count(bytes_per_worker) == expected
+
+
+def test_chunk_rows_follow_the_remaining_budget(monkeypatch):
+    budget = ResourceBudget(memory_limit_bytes=200 * MiB, cpu_limit=1, memory_budget_bytes=100 * MiB)
+    monkeypatch.setattr(resource_governor, "current_rss", lambda: 20 * MiB)
+    assert budget.available_bytes() == 80 * MiB
+    assert budget.chunk_rows(1024) == 20 * 1024
+    assert budget.chunk_rows(1024, share=0.5) == 40 * 1024
+
+    # over the budget only the minimum is left
+    monkeypatch.setattr(resource_governor, "current_rss", lambda: 150 * MiB)
+    assert budget.available_bytes() == 0
+    assert budget.chunk_rows(1024) == 1000
+    assert budget.spill_threshold_bytes() == 50 * MiB
+
+
+@pytest.fixture
+def governor_records():
+    # the project loggers don't propagate, so listen on the module logger itself
+    handler = logging.handlers.BufferingHandler(capacity=100)
+    resource_governor.logger.addHandler(handler)
+    yield handler.buffer
+    resource_governor.logger.removeHandler(handler)
+
+
+@pytest.mark.parametrize("samples, over_budget", [([10, 40, 20], False), ([10, 120, 20], True)])
+def test_rss_monitor_records_the_peak(monkeypatch, governor_records, samples, over_budget):
+    budget = ResourceBudget(memory_limit_bytes=200 * MiB, cpu_limit=1, memory_budget_bytes=100 * MiB)
+    readings = iter(samples)
+    # the last sample is repeated once the block has finished
+    monkeypatch.setattr(resource_governor, "current_rss", lambda: next(readings, samples[-1]) * MiB)
+
+    with RssMonitor(budget, label="water_ingress", interval_seconds=0.001) as monitor:
+        # let the sampler get through the readings
+        deadline = time.monotonic() + 5
+        while monitor.peak_rss < max(samples) * MiB and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    assert monitor.peak_rss == max(samples) * MiB
+    warnings = [record.getMessage() for record in governor_records if record.levelno == logging.WARNING]
+    assert bool(warnings) == over_budget
+    if over_budget:
+        assert warnings == ["'water_ingress' peaked at 120 MiB RSS, over the 100 MiB budget"]